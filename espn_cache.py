@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import nba_metrics
+
+# ==========================================
+# 📦 CACHE ODPOWIEDZI ESPN (ETag / Last-Modified)
+# ==========================================
+CACHE_DIR = os.path.join(os.environ.get("NBA_CACHE_DIR", ".cache"), "espn")
+
+# TTL zależny od stanu meczów: krótki gdy coś trwa ('in'), długi gdy wszystko 'pre'/'post'
+# (dla 'pre' nie dłuższy niż czas do najbliższego rozpoczęcia meczu)
+TTL_LIVE = 30
+TTL_IDLE = 15 * 60
+
+STATS = {"hit": 0, "miss": 0, "revalidated": 0, "stale": 0}
+_lock = threading.Lock()
+
+def _count(kind):
+    with _lock:
+        STATS[kind] += 1
+    nba_metrics.count(f"espn_cache_{kind}")
+
+def cache_key(url, params=None):
+    return url + ("?" + urlencode(sorted(params.items())) if params else "")
+
+def _path(key):
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+def _tip_off(event):
+    try:
+        return datetime.fromisoformat(event['date'].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, TypeError, ValueError):
+        return None
+
+def ttl_for(payload, now=None):
+    # Payload z samymi meczami 'pre' nie może przeżyć w cache startu pierwszego z nich -
+    # inaczej daemon przez kwadrans nie zobaczyłby, że mecz już trwa
+    now = now or time.time()
+    ttl = TTL_IDLE
+    for event in payload.get('events', []):
+        state = event.get('status', {}).get('type', {}).get('state')
+        if state == 'in':
+            return TTL_LIVE
+        if state == 'pre':
+            tip_off = _tip_off(event)
+            if tip_off is not None:
+                ttl = min(ttl, max(int(tip_off - now), TTL_LIVE))
+    return ttl
+
+def load(key):
+    try:
+        with open(_path(key), "r", encoding="utf-8") as f, nba_metrics.stage("json_decode"):
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save(key, entry):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _path(key)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def cached_get(session, url, params=None, timeout=10):
+    """GET z cache na dysku: świeży wpis -> bez sieci, przeterminowany -> warunkowy GET,
+    ESPN niedostępne -> ostatnia znana odpowiedź. Bez wpisu i bez sieci rzuca wyjątek."""
+    key = cache_key(url, params)
+    entry = load(key)
+    now = time.time()
+
+    if entry and now - entry["fetched_at"] < entry["ttl"]:
+        _count("hit")
+        return entry["payload"]
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry:
+            _count("revalidated")
+            entry["fetched_at"] = now
+            entry["ttl"] = ttl_for(entry["payload"], now)
+            save(key, entry)
+            return entry["payload"]
+        response.raise_for_status()
+        with nba_metrics.stage("json_decode"):
+            payload = response.json()
+    except Exception as e:
+        if entry:
+            _count("stale")
+            print(f"⚠️ ESPN niedostępne ({e}) - używam danych z cache sprzed {int(now - entry['fetched_at'])} s.")
+            return entry["payload"]
+        raise
+
+    _count("miss")
+    save(key, {
+        "fetched_at": now,
+        "ttl": ttl_for(payload, now),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "payload": payload,
+    })
+    return payload
+
+def summary():
+    return ", ".join(f"{k}: {v}" for k, v in STATS.items())
@@ -1,34 +1,91 @@
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import hashlib
+import json
 import os
 import datetime
+import random
+import threading
+import time
 import pytz
-import re
 
-# Konfiguracja klienta
-client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+import nba_metrics
+from nba_render import MAX_HTML_BYTES
 
-def run_audit():
-    # Pobieranie precyzyjnego czasu systemowego (NBA Eastern Time)
-    nba_tz = pytz.timezone('US/Eastern')
-    now = datetime.datetime.now(nba_tz)
-    today_date = now.strftime("%Y-%m-%d")
-    current_time = now.strftime("%H:%M")
+MODEL = "gemini-1.5-flash"
 
-    # Sprawdzenie czy plik z typami istnieje
-    if not os.path.exists('propozycje_typow.txt'):
-        print("Nie znaleziono pliku propozycje_typow.txt")
-        return
+# Audyt per mecz: równoległe zapytania z limitem współbieżności i backoffem przy limitach API
+AUDIT_WORKERS = int(os.environ.get("AUDIT_WORKERS", 4))
+AUDIT_RETRIES = 4
+AUDIT_BACKOFF = 2.0
+RETRYABLE_CODES = (429, 500, 503)
 
-    with open('propozycje_typow.txt', 'r', encoding='utf-8') as f:
-        typy = f.read()
+# Cache wyników na dysku: klucz = hash(typ, data), ważny przez AUDIT_CACHE_TTL sekund
+AUDIT_CACHE_DIR = os.path.join(os.environ.get("NBA_CACHE_DIR", ".cache"), "gemini")
+AUDIT_CACHE_TTL = int(os.environ.get("AUDIT_CACHE_TTL", 3 * 3600))
 
-    if not typy or len(typy.strip()) < 5:
-        print("Brak typów do analizy.")
-        return
+class FakeClient:
+    """Lokalny zamiennik genai.Client (GEMINI_FAKE=1): bez sieci i bez klucza API,
+    z deterministyczną odpowiedzią - do testów i uruchomień offline."""
+
+    def __init__(self, delay=0.0):
+        self.models = self
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
 
+    def generate_content(self, model, contents, config=None):
+        with self._lock:
+            self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(
+            role="model",
+            parts=[types.Part(text="🧪 Brak aktualnych raportów (Injury Report) na tę chwilę.\n- Werdykt: [✅ ZATWIERDZONY]")],
+        ))])
+
+_client = None
+
+def get_client():
+    # Konfiguracja klienta (leniwie - import modułu nie wymaga klucza API)
+    global _client
+    if _client is None:
+        if os.environ.get("GEMINI_FAKE"):
+            _client = FakeClient()
+        else:
+            _client = genai.Client(api_key=os.environ["GEMINI_API_KEY"])
+    return _client
+
+# UNIKALNE ZNACZNIKI BLOKU RAPORTU W index.html
+AUDIT_START = "<!-- AI_AUDIT_START -->"
+AUDIT_END = "<!-- AI_AUDIT_END -->"
+
+
+def inject_report(html_content, analiza_html):
+    """Podmienia blok między znacznikami (jedno przejście str.find, bez regex).
+    Przy pierwszym uruchomieniu wstawia blok nad stopką, a gdy jej nie ma - przed </body>.
+    Znacznik startu bez znacznika końca jest usuwany, a blok wstawiany od nowa."""
+    block = AUDIT_START + analiza_html + AUDIT_END
+    start = html_content.find(AUDIT_START)
+    if start != -1:
+        end = html_content.find(AUDIT_END, start)
+        if end != -1:
+            return html_content[:start] + block + html_content[end + len(AUDIT_END):]
+        # Osierocony znacznik startu (urwany zapis): usuwamy go, inaczej kolejny audyt
+        # wyciąłby wszystko między nim a nowym blokiem
+        html_content = html_content.replace(AUDIT_START, "")
+
+    for anchor in ('<div class="footer">', '</body>'):
+        pos = html_content.find(anchor)
+        if pos != -1:
+            return html_content[:pos] + block + html_content[pos:]
+    return html_content + block
+
+def build_system_instruction(today_date):
     # INSTRUKCJA SYSTEMOWA - BLOKADA HALUCYNACJI
-    system_instruction = f"""
+    return f"""
     Jesteś rygorystycznym analitykiem NBA. Twoja wiedza wewnętrzna jest przestarzała. 
     DZISIEJSZA DATA TO: {today_date}.
     
@@ -40,51 +97,111 @@ def run_audit():
     5. Odpowiadaj krótko, w punktach, używaj emoji.
     """
 
+def _cache_path(typ, today_date):
+    key = hashlib.sha256(f"{typ}|{today_date}".encode("utf-8")).hexdigest()
+    return os.path.join(AUDIT_CACHE_DIR, key + ".json")
+
+def load_cached_audit(typ, today_date):
+    try:
+        with open(_cache_path(typ, today_date), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry["created"] > AUDIT_CACHE_TTL:
+        return None
+    return entry["text"], entry["created"]
+
+def save_cached_audit(typ, today_date, text, created):
+    os.makedirs(AUDIT_CACHE_DIR, exist_ok=True)
+    path = _cache_path(typ, today_date)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"created": created, "typ": typ, "text": text}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def audit_pick(client, typ, today_date):
     prompt = f"""
-    Na podstawie DZISIEJSZYCH danych z sieci ({today_date}), sprawdź moje typy:
-    {typy}
+    Na podstawie DZISIEJSZYCH danych z sieci ({today_date}), sprawdź mój typ:
+    {typ}
 
-    Dla każdego meczu określ:
+    Określ:
     - Kluczowe braki w składach.
     - Werdykt: [✅ ZATWIERDZONY] lub [⚠️ RYZYKOWNY].
     """
+    config = types.GenerateContentConfig(
+        system_instruction=build_system_instruction(today_date),
+        tools=[types.Tool(google_search=types.GoogleSearch())]
+    )
+
+    for attempt in range(AUDIT_RETRIES + 1):
+        try:
+            # Wywołanie modelu Gemini 1.5 Flash (stabilne limity darmowe)
+            response = client.models.generate_content(model=MODEL, contents=prompt, config=config)
+            return response.text
+        except errors.APIError as e:
+            if e.code not in RETRYABLE_CODES or attempt == AUDIT_RETRIES:
+                raise
+            # Limit zapytań / przeciążenie: wykładniczy backoff z losowym rozrzutem
+            time.sleep(AUDIT_BACKOFF * 2 ** attempt + random.uniform(0, 1))
 
-    print(f"🚀 Uruchamiam rygorystyczny audyt live ({today_date})...")
+def audit_picks(picks, today_date, client=None):
+    """Audyt każdego typu osobno, równolegle (max AUDIT_WORKERS naraz).
+    Zwraca listę (typ, tekst, czas odpowiedzi); tekst = None gdy zapytanie dla tego meczu się nie udało."""
+    client = client or get_client()
 
-    try:
-        # Wywołanie modelu Gemini 1.5 Flash (stabilne limity darmowe)
-        response = client.models.generate_content(
-            model="gemini-1.5-flash",
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                system_instruction=system_instruction,
-                tools=[types.Tool(google_search=types.GoogleSearch())]
-            )
-        )
-        
-        tekst_analizy = response.text
-    except Exception as e:
-        print(f"Błąd API Gemini: {e}")
-        return
+    def audit_one(typ):
+        typ = str(typ)
+        cached = load_cached_audit(typ, today_date)
+        if cached is not None:
+            return typ, cached[0], cached[1], True
+        try:
+            text = audit_pick(client, typ, today_date)
+        except Exception as e:
+            print(f"Błąd API Gemini ({typ}): {e}")
+            return typ, None, None, False
+        created = time.time()
+        save_cached_audit(typ, today_date, text, created)
+        return typ, text, created, False
+
+    if not picks:
+        return []
+    with nba_metrics.stage("audit"), ThreadPoolExecutor(max_workers=min(AUDIT_WORKERS, len(picks))) as pool:
+        results = list(pool.map(audit_one, picks))
+
+    from_cache = sum(1 for *_, cached in results if cached)
+    failed = sum(1 for _, text, *_ in results if text is None)
+    nba_metrics.count("audit_cached", from_cache)
+    nba_metrics.count("audit_requested", len(results) - from_cache)
+    nba_metrics.count("audit_failed", failed)
+    print(f"📦 Audyt: {from_cache} z cache, {len(results) - from_cache} zapytań do Gemini.")
+    return [(typ, text, created) for typ, text, created, _ in results]
+
+def format_report(results):
+    sections = []
+    for typ, text, _ in results:
+        body = text.strip() if text is not None else "⚠️ Audyt niedostępny (błąd API) - brak weryfikacji składu."
+        sections.append(f"🏀 {typ}\n{body}")
+    return "\n\n".join(sections)
 
+def nba_now():
+    # Pobieranie precyzyjnego czasu systemowego (NBA Eastern Time)
+    return datetime.datetime.now(pytz.timezone('US/Eastern'))
+
+def report_stamp(results):
+    # Czas najnowszej odpowiedzi Gemini (ET) - wynik z cache nie zmienia znacznika, więc i strony
+    newest = max(created for _, text, created in results if text is not None)
+    return datetime.datetime.fromtimestamp(newest, pytz.timezone('US/Eastern')).strftime("%Y-%m-%d %H:%M")
+
+def save_report(tekst_analizy, stamp):
     # Zapis do pliku tekstowego (backup)
     with open('finalny_raport_dnia.txt', 'w', encoding='utf-8') as f:
-        f.write(f"--- KRYTYCZNY AUDYT LIVE ({today_date} {current_time} ET) ---\n")
+        f.write(f"--- KRYTYCZNY AUDYT LIVE ({stamp} ET) ---\n")
         f.write(tekst_analizy)
 
-    # Wstrzykiwanie do HTML
-    if os.path.exists('index.html'):
-        try:
-            with open('index.html', 'r', encoding='utf-8') as f:
-                html_content = f.read()
+def render_audit_html(tekst_analizy, stamp):
+    formatowany_tekst = tekst_analizy.replace('\n', '<br>')
 
-            formatowany_tekst = tekst_analizy.replace('\n', '<br>')
-            
-            # UNIKALNE ZNACZNIKI DLA REGEX
-            start_tag = ""
-            end_tag = ""
-            
-            analiza_html = f"""{start_tag}
+    return f"""
             <div style="margin: 40px auto; max-width: 1100px; padding: 0 20px;">
                 <div style="background: #0f172a; border: 2px solid #ef4444; border-radius: 20px; padding: 30px; box-shadow: 0 0 25px rgba(239, 68, 68, 0.15); border-left: 10px solid #ef4444;">
                     <div style="display: flex; align-items: center; gap: 15px; margin-bottom: 20px;">
@@ -92,7 +209,7 @@ def run_audit():
                         <div>
                             <h2 style="margin: 0; font-weight: 900; color: #ef4444; text-transform: uppercase; font-family: 'Montserrat', sans-serif; letter-spacing: -1px;">Weryfikator Składów AI</h2>
                             <div style="color: #94a3b8; font-size: 0.75rem; text-transform: uppercase; letter-spacing: 1px; font-family: 'Montserrat', sans-serif;">
-                                STATUS: Google Search Live | {today_date} {current_time} ET
+                                STATUS: Google Search Live | {stamp} ET
                             </div>
                         </div>
                     </div>
@@ -103,22 +220,76 @@ def run_audit():
                         AI AGENT ENFORCEMENT v2.0
                     </div>
                 </div>
-            </div>{end_tag}"""
+            </div>"""
+
+def build_audit_block(picks, export_report=False):
+    """Audyt typów przekazanych w pamięci (tryb pipeline).
+    Zwraca blok HTML razem ze znacznikami albo None, gdy żaden mecz nie został zweryfikowany."""
+    today_date = nba_now().strftime("%Y-%m-%d")
+    print(f"🚀 Uruchamiam rygorystyczny audyt live ({today_date}, {len(picks)} meczów)...")
+
+    results = audit_picks(picks, today_date)
+    if all(text is None for _, text, _ in results):
+        print("Błąd API Gemini: żaden mecz nie został zweryfikowany.")
+        return None
+
+    tekst_analizy = format_report(results)
+    stamp = report_stamp(results)
+    if export_report:
+        save_report(tekst_analizy, stamp)
+    return AUDIT_START + render_audit_html(tekst_analizy, stamp) + AUDIT_END
+
+def run_audit(profile=None):
+    metrics = nba_metrics.start_run("gemini_audit")
+    try:
+        with nba_metrics.profiled(profile):
+            _run_audit()
+    finally:
+        metrics.write()
+
+def _run_audit():
+    today_date = nba_now().strftime("%Y-%m-%d")
+
+    # Sprawdzenie czy plik z typami istnieje
+    if not os.path.exists('propozycje_typow.txt'):
+        print("Nie znaleziono pliku propozycje_typow.txt")
+        return
+
+    with open('propozycje_typow.txt', 'r', encoding='utf-8') as f:
+        typy = [line.strip() for line in f if line.strip()]
+
+    if not typy or len("".join(typy)) < 5:
+        print("Brak typów do analizy.")
+        return
+
+    print(f"🚀 Uruchamiam rygorystyczny audyt live ({today_date}, {len(typy)} meczów)...")
+
+    results = audit_picks(typy, today_date)
+    if all(text is None for _, text, _ in results):
+        print("Błąd API Gemini: żaden mecz nie został zweryfikowany.")
+        return
+    tekst_analizy = format_report(results)
+    stamp = report_stamp(results)
+    save_report(tekst_analizy, stamp)
+
+    # Wstrzykiwanie do HTML
+    if os.path.exists('index.html'):
+        try:
+            with open('index.html', 'r', encoding='utf-8') as f:
+                html_content = f.read()
 
             # Jeśli raport już istnieje, podmieniamy go. Jeśli nie, wstawiamy przed footerem.
-            if start_tag in html_content:
-                # re.escape chroni znaki specjalne w tagach komentarza
-                pattern = f"{re.escape(start_tag)}.*?{re.escape(end_tag)}"
-                html_content = re.sub(pattern, analiza_html, html_content, flags=re.DOTALL)
-            else:
-                # Jeśli to pierwsze uruchomienie, wstawiamy nad stopkę
-                if '<div class="footer">' in html_content:
-                    html_content = html_content.replace('<div class="footer">', analiza_html + '<div class="footer">')
-                else:
-                    html_content = html_content.replace('</body>', analiza_html + '</body>')
-
-            with open('index.html', 'w', encoding='utf-8') as f:
+            html_content = inject_report(html_content, render_audit_html(tekst_analizy, stamp))
+
+            size = len(html_content.encode('utf-8'))
+            if size > MAX_HTML_BYTES:
+                print(f"❌ index.html po wstrzyknięciu miałby {size} B (limit {MAX_HTML_BYTES} B) - pomijam zapis.")
+                return
+
+            with open('index.html.tmp', 'w', encoding='utf-8') as f:
                 f.write(html_content)
+            os.replace('index.html.tmp', 'index.html')
+            nba_metrics.count("bytes_written", size)
             
             print("✅ Raport pomyślnie wstrzyknięty do index.html")
         except Exception as e:
@@ -127,4 +298,7 @@ def run_audit():
     print("✅ Audyt zakończony sukcesem.")
 
 if __name__ == "__main__":
-    run_audit()
+    parser = argparse.ArgumentParser(description="Audyt typów przez Gemini + wstrzyknięcie raportu do index.html")
+    parser.add_argument("--profile", metavar="PLIK", help="zapisz profil cProfile przebiegu (np. audit.pstats)")
+    args = parser.parse_args()
+    run_audit(args.profile)
@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from datetime import datetime
+from itertools import chain
+
+import nba_store
+import update_nba
+from nba_render import (
+    GRID_END, PAGE_HEAD, iter_page_body, render_archive_link, render_archive_nav, render_archive_table,
+    render_footer, table_row, write_page,
+)
+
+# ==========================================
+# 🗂️ ARCHIWUM: strona na każdy dzień meczowy + indeksy sezonu i drużyn
+# ==========================================
+# Strony powstają z bazy historycznej (nba_store), więc pokazują typ sprzed meczu i wynik.
+# Manifest zapamiętuje hash danych źródłowych każdej strony - przebudowywane są tylko
+# nowe lub zmienione dni, a niezależne dni renderują się równolegle w puli procesów.
+ARCHIVE_DIR = os.environ.get("NBA_ARCHIVE_DIR", "archive")
+MANIFEST_NAME = "manifest.json"
+
+# Podbić przy zmianie wyglądu stron archiwum -> jednorazowa przebudowa wszystkiego
+ARCHIVE_VERSION = 1
+
+# Strony archiwum leżą w podkatalogu - sprite z logami jest poziom wyżej
+ASSET_PREFIX = "../"
+
+# Poniżej tylu stron pula procesów kosztuje więcej niż daje (codzienny przebieg: 1-2 dni)
+POOL_MIN_PAGES = 8
+
+def day_page(day):
+    return f"{day}.html"
+
+def season_page(season):
+    return f"season-{season}.html"
+
+def team_page(abbr, season):
+    return f"team-{abbr}-{season}.html"
+
+def source_hash(*parts):
+    sprite = update_nba.LOGO_MANIFEST['sprite'] if update_nba.LOGO_MANIFEST else None
+    payload = json.dumps([ARCHIVE_VERSION, sprite, *parts], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=0, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _row(row):
+    # Kolumny wpływające na wygląd strony (bez updated_at, który zmienia się przy każdym upsercie)
+    return {k: row[k] for k in row.keys() if k != 'updated_at'}
+
+def _hit(row):
+    if row['state'] != 'post' or not row['predicted_winner']:
+        return None
+    return row['predicted_winner'] == row['actual_winner']
+
+def _accuracy(rows):
+    hits = [h for h in map(_hit, rows) if h is not None]
+    return f"{sum(hits)}/{len(hits)}" if hits else "—"
+
+def _footer():
+    return render_footer(updated=datetime.now().strftime("%Y-%m-%d %H:%M"))
+
+# --- BUDOWANIE STRON (wywoływane w procesach puli) ---
+def build_day(path, day, season, rows):
+    games = [nba_store.game_from_row(row) for row in rows]
+    cards = (update_nba.render_card(game, ASSET_PREFIX) for game in games)
+    nav = render_archive_nav(
+        title=f"{day} · typy {_accuracy(rows)}",
+        links=render_archive_link(href=season_page(season), label=f"← Sezon {season}"),
+    )
+    write_page(path, chain(iter_page_body(cards), [nav]), _footer())
+    return os.path.getsize(path)
+
+def _index_page(path, nav, head, rows):
+    table = render_archive_table(head=table_row(head, tag="th"), rows="".join(rows))
+    write_page(path, [PAGE_HEAD, GRID_END, nav, table], _footer())
+    return os.path.getsize(path)
+
+def build_season(path, season, rows):
+    by_day = {}
+    for row in rows:
+        by_day.setdefault(row['game_date'], []).append(row)
+    teams = sorted({row['home_abbr'] for row in rows} | {row['away_abbr'] for row in rows})
+    nav = render_archive_nav(
+        title=f"Sezon {season} · typy {_accuracy(rows)}",
+        links=" ".join(render_archive_link(href=team_page(abbr, season), label=abbr) for abbr in teams),
+    )
+    table = [
+        table_row([render_archive_link(href=day_page(day), label=day), len(day_rows), _accuracy(day_rows)])
+        for day, day_rows in sorted(by_day.items(), reverse=True)
+    ]
+    return _index_page(path, nav, ["Dzień", "Mecze", "Typy"], table)
+
+def build_team(path, abbr, season, rows):
+    nav = render_archive_nav(
+        title=f"{abbr} · sezon {season} · typy {_accuracy(rows)}",
+        links=render_archive_link(href=season_page(season), label=f"← Sezon {season}"),
+    )
+    table = []
+    for row in reversed(rows):
+        home = row['home_abbr'] == abbr
+        opponent = ("vs " if home else "@ ") + (row['away_abbr'] if home else row['home_abbr'])
+        score = f"{row['away_score']}:{row['home_score']}" if row['state'] != 'pre' else ""
+        hit = _hit(row)
+        table.append(table_row([
+            render_archive_link(href=day_page(row['game_date']), label=row['game_date']),
+            opponent, score, row['predicted_winner'] or "—", "" if hit is None else ("✅" if hit else "❌"),
+        ]))
+    return _index_page(path, nav, ["Dzień", "Rywal", "Wynik", "Typ", ""], table)
+
+BUILDERS = {
+    'day': build_day,
+    'season': build_season,
+    'team': build_team,
+}
+
+def _build(job):
+    kind, path, args = job
+    return BUILDERS[kind](path, *args)
+
+# --- PLANOWANIE ---
+def plan_season(season, rows):
+    """Lista (strona, hash źródła, zadanie) dla dni, indeksu sezonu i drużyn jednego sezonu."""
+    rows = [_row(row) for row in rows]
+    by_day, by_team = {}, {}
+    for row in rows:
+        by_day.setdefault(row['game_date'], []).append(row)
+        by_team.setdefault(row['home_abbr'], []).append(row)
+        by_team.setdefault(row['away_abbr'], []).append(row)
+
+    pages = [(day_page(day), source_hash('day', day_rows), ('day', (day, season, day_rows)))
+             for day, day_rows in by_day.items()]
+    pages.append((season_page(season), source_hash('season', rows), ('season', (season, rows))))
+    pages += [(team_page(abbr, season), source_hash('team', abbr, team_rows), ('team', (abbr, season, team_rows)))
+              for abbr, team_rows in by_team.items()]
+    return pages
+
+def build_archive(out_dir=ARCHIVE_DIR, db_path=None, seasons=None, workers=None, force=False):
+    start = time.perf_counter()
+    with closing(nba_store.connect(db_path)) as conn:
+        seasons = seasons or nba_store.seasons(conn)
+        pages = [page for season in seasons for page in plan_season(season, nba_store.season_games(conn, season))]
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    if manifest.get('version') != ARCHIVE_VERSION:
+        manifest = {'version': ARCHIVE_VERSION, 'pages': {}}
+
+    todo = [(name, digest, job) for name, digest, job in pages
+            if force or manifest['pages'].get(name) != digest or not os.path.exists(os.path.join(out_dir, name))]
+    jobs = [(kind, os.path.join(out_dir, name), args) for name, _, (kind, args) in todo]
+
+    if len(jobs) >= POOL_MIN_PAGES and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sizes = list(pool.map(_build, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+    else:
+        sizes = [_build(job) for job in jobs]
+
+    for name, digest, _ in todo:
+        manifest['pages'][name] = digest
+    save_manifest(out_dir, manifest)
+
+    elapsed = time.perf_counter() - start
+    print(f"🗂️ Archiwum {out_dir}: {len(todo)}/{len(pages)} stron przebudowanych "
+          f"({sum(sizes) / 1024:.0f} KB) w {elapsed:.2f} s.")
+    return [name for name, _, _ in todo]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiwum stron dni meczowych z bazy historycznej")
+    parser.add_argument("--db", default=None, help=f"plik bazy (domyślnie {nba_store.DB_PATH})")
+    parser.add_argument("--out", default=ARCHIVE_DIR, help="katalog archiwum")
+    parser.add_argument("--season", type=int, action="append", help="tylko wybrane sezony (można powtórzyć)")
+    parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba CPU)")
+    parser.add_argument("--force", action="store_true", help="przebuduj wszystkie strony, ignorując manifest")
+    args = parser.parse_args()
+    build_archive(args.out, args.db, args.season, args.workers, args.force)
@@ -0,0 +1,186 @@
+import argparse
+import glob
+import importlib
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+
+import nba_games
+import nba_model
+import update_nba
+
+# ==========================================
+# 🧪 BACKTEST MODELI PROGNOZ
+# ==========================================
+# Nagrane scoreboardy ESPN (jeden plik JSON na dzień: RECORDINGS_DIR/YYYYMMDD.json) są odtwarzane
+# dzień po dniu: model najpierw prognozuje mecze dnia (wiedząc tylko o wcześniejszych wynikach),
+# potem dostaje ich wyniki. Sezony są niezależne, więc każdy liczy się w osobnym procesie.
+RECORDINGS_DIR = "recordings"
+PROB_EPS = 1e-6
+
+# Typy sezonu ESPN: 2 = sezon zasadniczy, 3 = playoffy (bez przedsezonu i Meczu Gwiazd)
+SEASON_TYPES = (2, 3)
+
+class EloPredictor:
+    def __init__(self):
+        self.model = nba_model.EloModel()
+
+    def predict(self, games):
+        return self.model.predict([g['home'] for g in games], [g['away'] for g in games])
+
+    def update(self, games):
+        self.model.update(
+            [g['home'] for g in games], [g['away'] for g in games],
+            [g['home_score'] for g in games], [g['away_score'] for g in games],
+        )
+
+class RecordPredictor:
+    """Dawna reguła ze strony: gospodarz, jeśli jego % zwycięstw + 0.05 > % rywala.
+    Bilanse liczone z odtworzonych wyników (nie z ESPN, bo tam zawierają już wynik meczu),
+    a przewaga zamieniona liniowo na prawdopodobieństwo, żeby dało się policzyć log-loss."""
+
+    def __init__(self):
+        self.wins = {}
+        self.games = {}
+
+    def pct(self, team):
+        played = self.games.get(team, 0)
+        return self.wins.get(team, 0) / played if played else 0.0
+
+    def predict(self, games):
+        edge = np.array([self.pct(g['home']) + 0.05 - self.pct(g['away']) for g in games])
+        return np.clip(0.5 + edge, 0.01, 0.99)
+
+    def update(self, games):
+        for g in games:
+            winner = g['home'] if g['home_score'] > g['away_score'] else g['away']
+            for team in (g['home'], g['away']):
+                self.games[team] = self.games.get(team, 0) + 1
+            self.wins[winner] = self.wins.get(winner, 0) + 1
+
+MODELS = {
+    'elo': EloPredictor,
+    'record': RecordPredictor,
+}
+
+def resolve_model(spec):
+    # Wbudowana nazwa albo "moduł:fabryka" zwracająca obiekt z predict(games) i update(games)
+    if spec in MODELS:
+        return MODELS[spec]
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+def load_finals(path):
+    # Eventy czytane strumieniowo (ijson, jeśli jest) - pliki wielodniowe nie są ładowane w całości
+    games = []
+    with open(path, "rb") as f:
+        for event in nba_games.iter_events(f):
+            game, _ = nba_games.parse_event(event)
+            if game is None or game.season_type not in SEASON_TYPES or game.state != 'post':
+                continue
+            games.append({'id': game.id, 'home': game.home.abbr, 'away': game.away.abbr,
+                          'home_score': game.home.score, 'away_score': game.away.score})
+    return games
+
+def backtest_season(model_spec, season, paths):
+    """Odtwarza jeden sezon (pliki posortowane po dacie). Zwraca sumy do metryk."""
+    model = resolve_model(model_spec)()
+    start = time.perf_counter()
+    n = correct = 0
+    log_loss = 0.0
+    # Mecz po północy UTC bywa na scoreboardach dwóch dni - liczony (i uczący model) tylko raz
+    seen = set()
+    for path in sorted(paths):
+        games = [g for g in load_finals(path) if g['id'] not in seen]
+        seen.update(g['id'] for g in games)
+        if not games:
+            continue
+        probs = np.clip(np.asarray(model.predict(games), dtype=float), PROB_EPS, 1 - PROB_EPS)
+        home_won = np.array([g['home_score'] > g['away_score'] for g in games])
+        correct += int(np.sum((probs >= 0.5) == home_won))
+        log_loss -= float(np.sum(np.where(home_won, np.log(probs), np.log(1 - probs))))
+        n += len(games)
+        model.update(games)
+    return {'model': model_spec, 'season': season, 'games': n, 'correct': correct,
+            'log_loss_sum': log_loss, 'seconds': time.perf_counter() - start}
+
+def run_backtest(model_specs, recordings_dir=RECORDINGS_DIR, seasons=None, workers=None):
+    by_season = {}
+    for path in glob.glob(os.path.join(recordings_dir, "*.json")):
+        # Nazwa pliku YYYYMMDD -> dzień ISO; reguła sezonu wspólna z parserem (nba_games)
+        day = os.path.basename(path)[:8]
+        season = nba_games.season_of_day(f"{day[:4]}-{day[4:6]}-{day[6:8]}")
+        if seasons and season not in seasons:
+            continue
+        by_season.setdefault(season, []).append(path)
+
+    jobs = [(spec, season, paths) for spec in model_specs for season, paths in sorted(by_season.items())]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(backtest_season, *zip(*jobs))) if jobs else []
+    return results, time.perf_counter() - start
+
+def print_report(results, wall):
+    print(f"{'model':<10} {'sezon':>6} {'mecze':>6} {'trafność':>9} {'log-loss':>9} {'mecze/s':>10}")
+    totals = {}
+    for r in results:
+        _print_row(r['model'], r['season'], r)
+        t = totals.setdefault(r['model'], {'games': 0, 'correct': 0, 'log_loss_sum': 0.0, 'seconds': 0.0})
+        for key in t:
+            t[key] += r[key]
+    for spec, t in totals.items():
+        _print_row(spec, "razem", t)
+    games = sum(r['games'] for r in results)
+    print(f"⏱️ {games} meczów w {wall:.2f} s ({games / wall if wall else 0:,.0f} meczów/s łącznie)")
+
+def _print_row(spec, season, r):
+    n = r['games']
+    accuracy = r['correct'] / n if n else 0.0
+    log_loss = r['log_loss_sum'] / n if n else math.nan
+    speed = n / r['seconds'] if r['seconds'] else 0.0
+    print(f"{spec:<10} {season:>6} {n:>6} {accuracy:>9.1%} {log_loss:>9.4f} {speed:>10,.0f}")
+
+def record_payloads(start, end, recordings_dir=RECORDINGS_DIR, workers=update_nba.FETCH_WORKERS):
+    # Nagrywanie scoreboardów (dzień po dniu) do backtestu; istniejące pliki są pomijane
+    os.makedirs(recordings_dir, exist_ok=True)
+    days = [d for d in update_nba.date_range(start, end)
+            if not os.path.exists(os.path.join(recordings_dir, d.strftime("%Y%m%d") + ".json"))]
+
+    def record_day(day):
+        payload = update_nba.fetch_scoreboard(day)
+        if payload is None:
+            return False
+        with open(os.path.join(recordings_dir, day.strftime("%Y%m%d") + ".json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        return True
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        saved = sum(pool.map(record_day, days))
+    print(f"✅ Nagrano {saved}/{len(days)} dni do {recordings_dir}/")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest modeli prognoz na nagranych scoreboardach ESPN")
+    parser.add_argument("--dir", default=RECORDINGS_DIR, help="katalog z nagraniami YYYYMMDD.json")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    rec = sub.add_parser("record", help="nagraj scoreboardy z zakresu dat (YYYY-MM-DD)")
+    rec.add_argument("start", type=date.fromisoformat)
+    rec.add_argument("end", type=date.fromisoformat)
+    run = sub.add_parser("run", help="odtwórz nagrania przez modele")
+    run.add_argument("--model", action="append", help=f"{'/'.join(MODELS)} albo moduł:fabryka (można podać kilka)")
+    run.add_argument("--season", type=int, action="append", help="tylko wybrane sezony")
+    run.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba CPU)")
+    args = parser.parse_args()
+
+    if args.cmd == "record":
+        record_payloads(args.start, args.end, args.dir)
+    else:
+        results, wall = run_backtest(args.model or list(MODELS), args.dir, args.season, args.workers)
+        if not results:
+            print(f"❌ Brak nagrań w {args.dir}/")
+        else:
+            print_report(results, wall)
@@ -0,0 +1,337 @@
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import espn_cache
+import gemini_audit
+import nba_feed
+import nba_games
+import nba_sim
+import nba_store
+import pipeline
+import update_nba
+from nba_render import iter_page_body, render_footer, write_page
+
+# ==========================================
+# 🏎️ BENCHMARK OFFLINE: odtwarzanie scoreboardów przez cały pipeline
+# ==========================================
+# Nagrane (recordings/YYYYMMDD.json) albo syntetyczne scoreboardy o setkach/tysiącach meczów
+# serwuje lokalny serwer HTTP udający ESPN, a Gemini zastępuje FakeClient - bez sieci i kluczy.
+# Każdy etap (fetch, parse, predict, render, store, feed, audit, inject, pipeline) jest mierzony
+# osobno: czas, mecze/s, szczyt pamięci (tracemalloc) i rozmiar wyniku. Porównanie z zapisanym
+# baseline kończy się kodem 1 przy regresji albo gdy index.html rośnie z przebiegu na przebieg.
+# W repozytorium leży baseline z --portable (same rozmiary) - sprawdzany w CI przy każdym PR.
+BASELINE_PATH = "bench_baseline.json"
+SIZES = (15, 500, 2000)
+INJECT_ROUNDS = 20
+
+# Progi regresji względem baseline (czas jest szumny - do tego minimalna różnica w sekundach)
+TIME_TOLERANCE = 1.5
+TIME_MIN_DELTA = 0.05
+MEMORY_TOLERANCE = 1.25
+MEMORY_MIN_DELTA_KB = 256
+SIZE_TOLERANCE = 1.10
+PORTABLE_METRICS = ('bytes',)
+
+STATES = ('pre', 'in', 'post')
+
+# --- FIXTURES ---
+def synthetic_tip_off(i, day):
+    # Start między 19:00 a 22:50 czasu NBA (ET) -> ISO w UTC jak w ESPN (zwykle już następny dzień UTC)
+    local = datetime.combine(date.fromisoformat(day), dtime(19), tzinfo=nba_games.NBA_TZ)
+    local += timedelta(minutes=10 * (i % 24))
+    return local, local.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+
+def synthetic_event(i, day, rng):
+    home, away = rng.sample(nba_sim.TEAMS, 2)
+    state = STATES[i % len(STATES)]
+    period = {'pre': 0, 'in': rng.randint(1, 4), 'post': 4}[state]
+    clock = f"{rng.randint(0, 11)}:{rng.randint(0, 59):02d}" if state == 'in' else "0:00"
+    local, tip_off = synthetic_tip_off(i, day)
+    detail = {'pre': local.strftime("%I:%M %p ET").lstrip("0"), 'in': f"Q{period} {clock}", 'post': "Final"}[state]
+    wins = {abbr: rng.randint(0, 60) for abbr in (home, away)}
+
+    def competitor(abbr, side):
+        score = 0 if state == 'pre' else rng.randint(70, 130)
+        return {
+            'homeAway': side,
+            'score': str(score),
+            'team': {'id': str(nba_sim.TEAMS.index(abbr) + 1), 'abbreviation': abbr,
+                     'shortDisplayName': abbr.title(), 'displayName': abbr.title()},
+            'records': [{'type': 'total', 'summary': f"{wins[abbr]}-{60 - wins[abbr]}"}],
+        }
+
+    return {
+        'id': f"{day.replace('-', '')}{i:05d}",
+        'date': tip_off,
+        'season': {'year': nba_games.season_of_day(day), 'type': 2},
+        'status': {'period': period, 'displayClock': clock,
+                   'type': {'state': state, 'detail': detail, 'shortDetail': detail}},
+        'competitions': [{'competitors': [competitor(home, 'home'), competitor(away, 'away')]}],
+    }
+
+def synthetic_slate(n, day=None, seed=0):
+    # Deterministyczny scoreboard z n meczami (mieszanka 'pre' / 'in' / 'post')
+    rng = random.Random(seed)
+    day = day or date.today().isoformat()
+    return {'events': [synthetic_event(i, day, rng) for i in range(n)]}
+
+def load_fixtures(sizes=SIZES, recordings_dir=None):
+    fixtures = [(f"synthetic-{n}", synthetic_slate(n)) for n in sizes]
+    for path in sorted(glob.glob(os.path.join(recordings_dir, "*.json"))) if recordings_dir else ():
+        with open(path, "r", encoding="utf-8") as f:
+            fixtures.append((f"recording-{os.path.basename(path)[:-5]}", json.load(f)))
+    return fixtures
+
+# --- LOKALNY ESPN ---
+@contextmanager
+def replay_server(payload):
+    """Serwer HTTP na losowym porcie oddający zawsze ten sam scoreboard (z ETag i 304)."""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/scoreboard", len(body)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+# Ścieżki, które w sandboksie wskazują do katalogu tymczasowego (nawet gdy NBA_DB / NBA_CACHE_DIR są ustawione)
+SANDBOX_PATHS = (
+    (nba_store, 'DB_PATH', "nba_history.sqlite"),
+    (espn_cache, 'CACHE_DIR', os.path.join(".cache", "espn")),
+    (update_nba, 'CARD_CACHE_FILE', os.path.join(".cache", "cards.json")),
+    (gemini_audit, 'AUDIT_CACHE_DIR', os.path.join(".cache", "gemini")),
+)
+
+@contextmanager
+def sandbox(espn_url):
+    # Każdy fixture w osobnym katalogu: pusty cache, baza i index.html; ESPN -> lokalny serwer, Gemini -> FakeClient
+    previous_dir = os.getcwd()
+    saved = [(module, attr, getattr(module, attr)) for module, attr, _ in SANDBOX_PATHS]
+    saved += [(update_nba, 'ESPN_API', update_nba.ESPN_API), (gemini_audit, '_client', gemini_audit._client)]
+    with tempfile.TemporaryDirectory(prefix="nba-bench-") as tmp:
+        os.chdir(tmp)
+        for module, attr, path in SANDBOX_PATHS:
+            setattr(module, attr, os.path.join(tmp, path))
+        update_nba.ESPN_API = espn_url
+        gemini_audit._client = gemini_audit.FakeClient()
+        try:
+            yield tmp
+        finally:
+            for module, attr, value in saved:
+                setattr(module, attr, value)
+            os.chdir(previous_dir)
+
+# --- POMIAR ---
+def measure(results, name, items, fn):
+    """Uruchamia fn() z wyciszonym stdout; zapisuje czas, przepustowość, szczyt pamięci i rozmiar wyniku.
+    fn zwraca (wartość, bajty wyniku)."""
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        value, size = fn()
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    results[name] = {
+        'wall_s': round(wall, 4),
+        'items_per_s': round(items / wall, 1) if wall > 0 else None,
+        'peak_kb': round((peak - base) / 1024, 1),
+        'bytes': size,
+    }
+    return value
+
+def _size(*paths):
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+def bench_fixture(payload):
+    """Wszystkie etapy dla jednego scoreboardu. Zwraca (wyniki etapów, lista problemów)."""
+    results, problems = {}, []
+    # Przepustowość liczona w meczach, które parser przyjął (odrzucone eventy nie są przetwarzane)
+    events = len(payload.get('events', []))
+    n = len(nba_games.parse_scoreboard(payload)[0])
+    if n < events:
+        problems.append(f"parse: odrzucono {events - n}/{events} eventów")
+    with replay_server(payload) as (url, body_size), sandbox(url):
+        data = measure(results, 'fetch_cold', n, lambda: (update_nba.get_espn_data(), body_size))
+        measure(results, 'fetch_warm', n, lambda: (update_nba.get_espn_data(), body_size))
+        if not data:
+            return results, ["brak danych z lokalnego serwera ESPN"]
+
+        measure(results, 'parse', n, lambda: (nba_games.parse_scoreboard(data), 0))
+        games = measure(results, 'predict', n, lambda: (update_nba.prepare_games(data['events']), 0))
+
+        def render():
+            cards = (update_nba.render_card(game) for game in games)
+            write_page("index.html", iter_page_body(cards), render_footer(updated="bench"))
+            return None, _size("index.html")
+        measure(results, 'render', n, render)
+
+        def store():
+            nba_store.record_games([nba_store.game_row(game) for game in games])
+            return None, _size(nba_store.DB_PATH)
+        measure(results, 'store', n, store)
+
+        def feed():
+            nba_feed.publish(games, index_written=True)
+            return None, _size(nba_feed.FEED_PATH)
+        measure(results, 'feed', n, feed)
+
+        picks = [update_nba.Pick(g.away.name, g.home.name, g.winner, g.winner_prob) for g in games if g.state == 'pre']
+        def audit():
+            block = gemini_audit.build_audit_block(picks) if picks else None
+            return block, len((block or "").encode("utf-8"))
+        block = measure(results, 'audit', max(len(picks), 1), audit)
+
+        def inject():
+            # Wielokrotne wstrzyknięcie tego samego raportu nie może powiększać strony
+            with open("index.html", "r", encoding="utf-8") as f:
+                html = f.read()
+            report_html = (block or "").removeprefix(gemini_audit.AUDIT_START).removesuffix(gemini_audit.AUDIT_END)
+            sizes = []
+            for _ in range(INJECT_ROUNDS):
+                html = gemini_audit.inject_report(html, report_html)
+                sizes.append(len(html.encode("utf-8")))
+            return sizes, sizes[-1]
+        sizes = measure(results, 'inject', INJECT_ROUNDS, inject)
+        if len(set(sizes)) != 1:
+            problems.append(f"inject: index.html rośnie z przebiegu na przebieg ({sizes[0]} B -> {sizes[-1]} B)")
+
+        def run_pipeline():
+            pipeline.run_pipeline()
+            return None, _size("index.html")
+        # Pierwszy przebieg buduje cache kart, drugi powinien z niego korzystać i dać tę samą stronę
+        for name in ('pipeline', 'pipeline_repeat'):
+            measure(results, name, n, run_pipeline)
+        if results['pipeline_repeat']['bytes'] != results['pipeline']['bytes']:
+            problems.append(f"pipeline: index.html zmienia rozmiar między przebiegami "
+                            f"({results['pipeline']['bytes']} B -> {results['pipeline_repeat']['bytes']} B)")
+    return results, problems
+
+def run_bench(fixtures, repeat=1):
+    # Przy repeat > 1 z każdego etapu bierzemy najszybszy przebieg (najmniej szumu)
+    report, problems = {}, []
+    tracemalloc.start()
+    try:
+        for name, payload in fixtures:
+            runs = []
+            for _ in range(repeat):
+                results, issues = bench_fixture(payload)
+                runs.append(results)
+                problems += [f"{name}: {issue}" for issue in issues]
+            report[name] = {stage: min((r[stage] for r in runs if stage in r), key=lambda m: m['wall_s'])
+                            for stage in runs[0]}
+    finally:
+        tracemalloc.stop()
+    return report, sorted(set(problems))
+
+# --- BASELINE ---
+def compare(report, baseline):
+    """Lista regresji względem baseline (tylko etapy i metryki obecne w obu - baseline
+    z --portable ma sam rozmiar wyniku, niezależny od maszyny)."""
+    regressions = []
+    for fixture, stages in report.items():
+        for stage, now in stages.items():
+            before = baseline.get(fixture, {}).get(stage)
+            if not before:
+                continue
+            label = f"{fixture}/{stage}"
+            if ('wall_s' in before and now['wall_s'] > before['wall_s'] * TIME_TOLERANCE
+                    and now['wall_s'] - before['wall_s'] > TIME_MIN_DELTA):
+                regressions.append(f"{label}: czas {before['wall_s']:.3f} s -> {now['wall_s']:.3f} s")
+            if ('peak_kb' in before and now['peak_kb'] > before['peak_kb'] * MEMORY_TOLERANCE
+                    and now['peak_kb'] - before['peak_kb'] > MEMORY_MIN_DELTA_KB):
+                regressions.append(f"{label}: pamięć {before['peak_kb']:.0f} KB -> {now['peak_kb']:.0f} KB")
+            if 'bytes' in before and now['bytes'] > before['bytes'] * SIZE_TOLERANCE:
+                regressions.append(f"{label}: rozmiar {before['bytes']} B -> {now['bytes']} B")
+    return regressions
+
+def portable(report):
+    # Do repozytorium / CI: czas i pamięć zależą od maszyny, rozmiar wyniku nie
+    return {fixture: {stage: {k: m[k] for k in PORTABLE_METRICS} for stage, m in stages.items()}
+            for fixture, stages in report.items()}
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def print_report(report):
+    print(f"{'fixture / etap':<38} {'czas':>9} {'mecze/s':>11} {'pamięć':>10} {'wynik':>11}")
+    for fixture, stages in report.items():
+        for stage, m in stages.items():
+            rate = f"{m['items_per_s']:,.0f}" if m['items_per_s'] else "-"
+            print(f"{fixture + ' / ' + stage:<38} {m['wall_s']:>8.3f}s {rate:>11} "
+                  f"{m['peak_kb']:>7.0f} KB {m['bytes'] / 1024:>8.1f} KB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline'u NBA (lokalny ESPN + fake Gemini)")
+    parser.add_argument("--sizes", type=int, nargs="*", default=list(SIZES), help="rozmiary syntetycznych scoreboardów")
+    parser.add_argument("--recordings", metavar="KATALOG", help="dodatkowo odtwórz nagrane scoreboardy (YYYYMMDD.json)")
+    parser.add_argument("--repeat", type=int, default=1, help="powtórzenia każdego fixture (liczy się najszybsze)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"plik baseline (domyślnie {BASELINE_PATH})")
+    parser.add_argument("--save-baseline", action="store_true", help="zapisz wyniki jako nowy baseline")
+    parser.add_argument("--portable", action="store_true",
+                        help="z --save-baseline: zapisz tylko metryki niezależne od maszyny (rozmiary)")
+    parser.add_argument("--out", metavar="PLIK", help="zapisz pełny raport jako JSON")
+    args = parser.parse_args()
+
+    baseline_path = os.path.abspath(args.baseline)
+    out_path = os.path.abspath(args.out) if args.out else None
+    report, problems = run_bench(load_fixtures(args.sizes, args.recordings), args.repeat)
+    print_report(report)
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({'generated': datetime.now().isoformat(timespec="seconds"), 'stages': report}, f, indent=1)
+
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(portable(report) if args.portable else report, f, indent=1, sort_keys=True)
+        print(f"💾 Baseline zapisany do {baseline_path}")
+    else:
+        baseline = load_baseline(baseline_path)
+        if baseline is None:
+            print(f"ℹ️ Brak baseline ({baseline_path}) - uruchom z --save-baseline, żeby go utworzyć.")
+        else:
+            problems += compare(report, baseline)
+
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Benchmark bez regresji.")
@@ -0,0 +1,99 @@
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+
+import nba_metrics
+
+try:
+    import brotli
+except ImportError:  # brotli jest opcjonalny - bez niego powstają tylko pliki .gz
+    brotli = None
+
+# ==========================================
+# 📡 FEED DANYCH: games.json + dziennik zmian NDJSON + wersje skompresowane
+# ==========================================
+FEED_VERSION = 1
+FEED_PATH = "games.json"
+CHANGES_PATH = "games_changes.ndjson"
+
+# Pola, których zmiana trafia do dziennika zmian
+TRACKED = ('state', 'status', 'home_score', 'away_score')
+
+def game_entry(game):
+    return {
+        'id': game.id,
+        'date': game.date,
+        'state': game.state,
+        'status': game.detail,
+        'home': {'abbr': game.home.abbr, 'name': game.home.name, 'score': game.home.score, 'record': game.home.record},
+        'away': {'abbr': game.away.abbr, 'name': game.away.name, 'score': game.away.score, 'record': game.away.record},
+        'prediction': {'winner': game.winner, 'home_win_prob': game.home_prob, 'live_home_win_prob': game.live_prob},
+    }
+
+def _flat(entry):
+    return {'state': entry['state'], 'status': entry['status'],
+            'home_score': entry['home']['score'], 'away_score': entry['away']['score']}
+
+def load_feed(path=FEED_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            feed = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return feed if feed.get('version') == FEED_VERSION else None
+
+def diff_games(old_games, new_games, ts):
+    # Linie dziennika: nowe mecze i zmiany wyniku/statusu względem poprzedniego games.json
+    old = {g['id']: _flat(g) for g in old_games}
+    changes = []
+    for entry in new_games:
+        now = _flat(entry)
+        before = old.get(entry['id'])
+        if before is None:
+            changes.append({'ts': ts, 'id': entry['id'], 'type': 'new', **now})
+        elif before != now:
+            changes.append({'ts': ts, 'id': entry['id'], 'type': 'update',
+                            **{k: now[k] for k in TRACKED if now[k] != before[k]}})
+    return changes
+
+def precompress(path):
+    # Obok pliku zapisujemy .gz (i .br, jeśli jest brotli) - serwer może je oddać bez kompresji w locie
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + ".br", "wb") as f:
+            f.write(brotli.compress(data, quality=11))
+
+def _write_json(path, obj):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    nba_metrics.count("bytes_written", os.path.getsize(path))
+
+def publish(games, index_written=False, html_path="index.html"):
+    """Aktualizuje games.json i dziennik zmian (tylko gdy coś się zmieniło) oraz ich wersje .gz/.br."""
+    entries = [game_entry(game) for game in games]
+    previous = load_feed()
+    ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    if previous is not None and previous['games'] == entries:
+        changes = []
+    else:
+        changes = diff_games(previous['games'] if previous else [], entries, ts)
+        _write_json(FEED_PATH, {'version': FEED_VERSION, 'generated': ts, 'games': entries})
+        precompress(FEED_PATH)
+
+    if changes:
+        with open(CHANGES_PATH, "a", encoding="utf-8") as f:
+            for line in changes:
+                f.write(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n")
+        precompress(CHANGES_PATH)
+
+    if index_written or not os.path.exists(html_path + ".gz"):
+        precompress(html_path)
+    print(f"📡 Feed: {len(entries)} meczów w {FEED_PATH}, {len(changes)} zmian w {CHANGES_PATH}.")
+    return changes
@@ -0,0 +1,219 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+try:
+    import ijson
+except ImportError:  # ijson jest opcjonalny - bez niego plik jest wczytywany w całości
+    ijson = None
+
+# ==========================================
+# 🏀 MODEL MECZU: Game / TeamSide + parser payloadu ESPN
+# ==========================================
+# Jeden przebieg po evencie ESPN -> zwarty obiekt Game, wspólny dla renderowania, modelu,
+# bazy, feedu i typów dla Gemini. Błędy pojedynczych pól są zbierane (z wartością domyślną),
+# a mecz odpada tylko gdy brakuje czegoś, bez czego nie da się go pokazać.
+NBA_TZ = ZoneInfo("America/New_York")
+STATES = ('pre', 'in', 'post')
+
+PERIODS = 4
+PERIOD_SECONDS = 12 * 60
+
+@dataclass(slots=True)
+class TeamSide:
+    abbr: str
+    name: str
+    score: int = 0
+    record: str = "0-0"
+
+@dataclass(slots=True)
+class Game:
+    id: str
+    date: str           # start meczu w UTC (ISO, jak w ESPN)
+    day: str            # dzień meczowy wg czasu NBA (ET), YYYY-MM-DD
+    season: int
+    season_type: int    # 1 przedsezon, 2 sezon zasadniczy, 3 playoffy
+    state: str          # 'pre', 'in', 'post'
+    detail: str
+    short_detail: str
+    period: int
+    clock: str
+    home: TeamSide
+    away: TeamSide
+    home_prob: float = None   # uzupełniane przez model
+    live_prob: float = None   # szansa gospodarzy w trakcie meczu ('in')
+
+    @property
+    def winner(self):
+        # Typ modelu (nazwa drużyny)
+        if self.home_prob is None:
+            return None
+        return self.home.name if self.home_prob >= 0.5 else self.away.name
+
+    @property
+    def winner_prob(self):
+        return self.home_prob if self.home_prob >= 0.5 else 1 - self.home_prob
+
+    @property
+    def seconds_left(self):
+        # Czas do końca regulaminowego meczu (w dogrywce: do końca dogrywki) z period + displayClock
+        try:
+            minutes, _, seconds = self.clock.rpartition(":")
+            clock = int(minutes or 0) * 60 + float(seconds)
+        except (AttributeError, ValueError):
+            clock = 0.0
+        if self.period < 1:
+            return float(PERIODS * PERIOD_SECONDS)
+        return clock + max(PERIODS - self.period, 0) * PERIOD_SECONDS
+
+    @property
+    def actual_winner(self):
+        if self.state != 'post':
+            return None
+        return self.home.name if self.home.score > self.away.score else self.away.name
+
+def game_day(iso_date):
+    # ESPN podaje czas startu w UTC ("2026-01-18T00:30Z") - dzień meczowy liczymy wg czasu NBA (ET)
+    tip_off = datetime.fromisoformat(iso_date.replace("Z", "+00:00"))
+    return tip_off.astimezone(NBA_TZ).strftime("%Y-%m-%d")
+
+def season_of_day(day):
+    # Sezon NBA nazywany rokiem, w którym się kończy (październik 2025 -> sezon 2026)
+    year, month = int(day[:4]), int(day[5:7])
+    return year + 1 if month >= 8 else year
+
+def _int(value, field, errors, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        errors.append(f"{field}: niepoprawna liczba {value!r}")
+        return default
+
+def _str(obj, key, field, errors, default=""):
+    value = obj.get(key) if isinstance(obj, dict) else None
+    if isinstance(value, str):
+        return value
+    errors.append(f"{field}: brak pola")
+    return default
+
+def _side(competitor, prefix, errors):
+    team = competitor.get('team')
+    if not isinstance(team, dict):
+        team = {}
+    abbr = team.get('abbreviation')
+    if not isinstance(abbr, str) or not abbr:
+        errors.append(f"{prefix}.team.abbreviation: brak pola")
+        return None
+    name = team.get('shortDisplayName') or team.get('displayName')
+    if not isinstance(name, str):
+        errors.append(f"{prefix}.team.shortDisplayName: brak pola")
+        name = abbr
+    score = _int(competitor.get('score', 0), f"{prefix}.score", errors)
+    record = "0-0"
+    records = competitor.get('records') or []
+    if not isinstance(records, list):
+        errors.append(f"{prefix}.records: oczekiwano listy")
+        records = []
+    for i, r in enumerate(records):
+        if not isinstance(r, dict):
+            errors.append(f"{prefix}.records[{i}]: oczekiwano obiektu")
+            continue
+        if r.get('type') == 'total':
+            summary = r.get('summary')
+            if isinstance(summary, str):
+                record = summary
+            else:
+                errors.append(f"{prefix}.records[{i}].summary: brak pola")
+            break
+    return TeamSide(abbr, name, score, record)
+
+def parse_event(event):
+    """Event ESPN -> (Game albo None, lista błędów pól)."""
+    errors = []
+    if not isinstance(event, dict):
+        return None, ["event: oczekiwano obiektu"]
+
+    event_id = event.get('id')
+    if not isinstance(event_id, str) or not event_id:
+        return None, ["id: brak pola"]
+    date = event.get('date')
+    try:
+        day = game_day(date)
+    except (AttributeError, TypeError, ValueError):
+        return None, [f"date: niepoprawna data {date!r}"]
+
+    status = event.get('status')
+    if not isinstance(status, dict):
+        return None, ["status: oczekiwano obiektu"]
+    status_type = status.get('type')
+    if not isinstance(status_type, dict):
+        return None, ["status.type: oczekiwano obiektu"]
+    state = status_type.get('state')
+    if state not in STATES:
+        return None, [f"status.type.state: nieznany stan {state!r}"]
+
+    home = away = None
+    try:
+        competitors = event['competitions'][0]['competitors']
+    except (KeyError, IndexError, TypeError):
+        return None, ["competitions[0].competitors: brak pola"]
+    if not isinstance(competitors, list):
+        return None, ["competitions[0].competitors: oczekiwano listy"]
+    for i, competitor in enumerate(competitors):
+        if not isinstance(competitor, dict):
+            errors.append(f"competitors[{i}]: oczekiwano obiektu")
+            continue
+        side = competitor.get('homeAway')
+        if side == 'home':
+            home = _side(competitor, 'home', errors)
+        elif side == 'away':
+            away = _side(competitor, 'away', errors)
+    if home is None or away is None:
+        return None, errors + ["competitors: brak gospodarza lub gościa"]
+
+    season_info = event.get('season')
+    if not isinstance(season_info, dict):
+        season_info = {}
+    clock = status.get('displayClock', "0:00")
+    if not isinstance(clock, str):
+        errors.append(f"status.displayClock: niepoprawny zegar {clock!r}")
+        clock = "0:00"
+    season = season_info.get('year') or season_of_day(day)
+    game = Game(
+        id=event_id,
+        date=date,
+        day=day,
+        season=_int(season, "season.year", errors, season_of_day(day)),
+        season_type=_int(season_info.get('type', 2), "season.type", errors, 2),
+        state=state,
+        detail=_str(status_type, 'detail', "status.type.detail", errors),
+        short_detail=_str(status_type, 'shortDetail', "status.type.shortDetail", errors),
+        period=_int(status.get('period', 0), "status.period", errors),
+        clock=clock or "0:00",
+        home=home,
+        away=away,
+    )
+    return game, errors
+
+def parse_events(events):
+    # Generator (Game albo None, błędy) - nie trzyma listy wszystkich meczów
+    for event in events:
+        yield (event.get('id') if isinstance(event, dict) else None), *parse_event(event)
+
+def parse_scoreboard(payload):
+    games, errors = [], {}
+    for event_id, game, event_errors in parse_events(payload.get('events', [])):
+        if event_errors:
+            errors[event_id] = event_errors
+        if game is not None:
+            games.append(game)
+    return games, errors
+
+def iter_events(fp):
+    """Eventy z pliku scoreboardu jeden po drugim. Z ijson bez budowania całego drzewa JSON
+    (duże payloady wielodniowe), bez niego - zwykłe json.load."""
+    if ijson is not None:
+        yield from ijson.items(fp, 'events.item', use_float=True)
+    else:
+        yield from json.load(fp).get('events', [])
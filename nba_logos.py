@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# ==========================================
+# 🖼️ LOGA DRUŻYN: lokalna kopia + jeden sprite SVG
+# ==========================================
+# Loga są pobierane z CDN NBA raz (build step: python nba_logos.py) do LOGO_DIR, deduplikowane
+# po ID drużyny (NO/NOP, GS/GSW, WSH/WAS... to ten sam plik) i sklejane w jeden sprite
+# z <symbol> na drużynę. Nazwa sprite'a zawiera hash treści, więc cache przeglądarki
+# unieważnia się sam. Karty odwołują się do niego przez <use href="sprite#symbol">.
+LOGO_DIR = os.path.join("assets", "logos")
+SPRITE_DIR = "static"
+MANIFEST_PATH = os.path.join(SPRITE_DIR, "logos.json")
+DEFAULT_KEY = "nba"
+
+# Rozszerzony słownik logo
+NBA_LOGOS = {
+    'ATL': 'https://cdn.nba.com/logos/nba/1610612737/global/L/logo.svg',
+    'BOS': 'https://cdn.nba.com/logos/nba/1610612738/global/L/logo.svg',
+    'CLE': 'https://cdn.nba.com/logos/nba/1610612739/global/L/logo.svg',
+    'NOP': 'https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg',
+    'NO':  'https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg',
+    'CHI': 'https://cdn.nba.com/logos/nba/1610612741/global/L/logo.svg',
+    'DAL': 'https://cdn.nba.com/logos/nba/1610612742/global/L/logo.svg',
+    'DEN': 'https://cdn.nba.com/logos/nba/1610612743/global/L/logo.svg',
+    'GSW': 'https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg',
+    'GS':  'https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg',
+    'HOU': 'https://cdn.nba.com/logos/nba/1610612745/global/L/logo.svg',
+    'LAC': 'https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg',
+    'LAL': 'https://cdn.nba.com/logos/nba/1610612747/global/L/logo.svg',
+    'MIA': 'https://cdn.nba.com/logos/nba/1610612748/global/L/logo.svg',
+    'MIL': 'https://cdn.nba.com/logos/nba/1610612749/global/L/logo.svg',
+    'MIN': 'https://cdn.nba.com/logos/nba/1610612750/global/L/logo.svg',
+    'BKN': 'https://cdn.nba.com/logos/nba/1610612751/global/L/logo.svg',
+    'NYK': 'https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg',
+    'NY':  'https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg',
+    'ORL': 'https://cdn.nba.com/logos/nba/1610612753/global/L/logo.svg',
+    'IND': 'https://cdn.nba.com/logos/nba/1610612754/global/L/logo.svg',
+    'PHI': 'https://cdn.nba.com/logos/nba/1610612755/global/L/logo.svg',
+    'PHX': 'https://cdn.nba.com/logos/nba/1610612756/global/L/logo.svg',
+    'POR': 'https://cdn.nba.com/logos/nba/1610612757/global/L/logo.svg',
+    'SAC': 'https://cdn.nba.com/logos/nba/1610612758/global/L/logo.svg',
+    'SAS': 'https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg',
+    'SA':  'https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg',
+    'OKC': 'https://cdn.nba.com/logos/nba/1610612760/global/L/logo.svg',
+    'TOR': 'https://cdn.nba.com/logos/nba/1610612761/global/L/logo.svg',
+    'UTA': 'https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg',
+    'MEM': 'https://cdn.nba.com/logos/nba/1610612763/global/L/logo.svg',
+    'WAS': 'https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg',
+    'DET': 'https://cdn.nba.com/logos/nba/1610612765/global/L/logo.svg',
+    'CHA': 'https://cdn.nba.com/logos/nba/1610612766/global/L/logo.svg',
+    'WSH': 'https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg',
+    'UTAH': 'https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg',
+}
+DEFAULT_LOGO = 'https://cdn.nba.com/logos/nba/nba-logoman-70x70.svg'
+
+_TEAM_ID = re.compile(r"/nba/(\d+)/global/")
+_SVG_ROOT = re.compile(r"<svg\b([^>]*)>(.*)</svg>", re.DOTALL)
+_ATTR = re.compile(r'([\w:-]+)\s*=\s*"([^"]*)"')
+_ID = re.compile(r'\bid="([^"]+)"')
+_STRIP = re.compile(r"<\?xml.*?\?>|<!--.*?-->|<title>.*?</title>|<metadata>.*?</metadata>", re.DOTALL)
+
+def logo_key(url):
+    match = _TEAM_ID.search(url)
+    return match.group(1) if match else DEFAULT_KEY
+
+def unique_logos():
+    # Jeden wpis na drużynę (po ID z adresu CDN) + logo domyślne
+    logos = {logo_key(url): url for url in NBA_LOGOS.values()}
+    logos[DEFAULT_KEY] = DEFAULT_LOGO
+    return logos
+
+def vendor_logos(logo_dir=LOGO_DIR, workers=8):
+    """Pobiera brakujące loga do logo_dir (każde ID drużyny tylko raz)."""
+    os.makedirs(logo_dir, exist_ok=True)
+    missing = {key: url for key, url in unique_logos().items()
+               if not os.path.exists(os.path.join(logo_dir, key + ".svg"))}
+
+    def download(item):
+        key, url = item
+        try:
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"⚠️ Nie udało się pobrać logo {key}: {e}")
+            return False
+        with open(os.path.join(logo_dir, key + ".svg"), "wb") as f:
+            f.write(response.content)
+        return True
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            saved = sum(pool.map(download, missing.items()))
+        print(f"🖼️ Pobrano {saved}/{len(missing)} brakujących logo do {logo_dir}/")
+
+def symbol_markup(key, svg_text):
+    """Zamienia plik SVG na <symbol>. ID wewnątrz (gradienty, maski) dostają prefiks drużyny,
+    żeby nie kolidowały między logami w jednym sprite."""
+    match = _SVG_ROOT.search(_STRIP.sub("", svg_text))
+    if not match:
+        raise ValueError(f"logo {key}: brak elementu <svg>")
+    attrs = dict(_ATTR.findall(match.group(1)))
+    view_box = attrs.get("viewBox")
+    if not view_box:
+        width = re.sub(r"[^\d.]", "", attrs.get("width", "100")) or "100"
+        height = re.sub(r"[^\d.]", "", attrs.get("height", "100")) or "100"
+        view_box = f"0 0 {width} {height}"
+
+    body = match.group(2).strip()
+    prefix = f"t{key}-"
+    for old_id in set(_ID.findall(body)):
+        new_id = prefix + old_id
+        body = body.replace(f'id="{old_id}"', f'id="{new_id}"')
+        body = body.replace(f"url(#{old_id})", f"url(#{new_id})")
+        body = body.replace(f'href="#{old_id}"', f'href="#{new_id}"')
+    return f'<symbol id="team-{key}" viewBox="{view_box}">{body}</symbol>'
+
+def build_sprite(logo_dir=LOGO_DIR, sprite_dir=SPRITE_DIR, manifest_path=MANIFEST_PATH):
+    """Skleja lokalne loga w static/logos.<hash>.svg i zapisuje manifest {skrót -> symbol}."""
+    symbols = {}
+    for key in sorted(unique_logos()):
+        path = os.path.join(logo_dir, key + ".svg")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                symbols[key] = symbol_markup(key, f.read())
+            except ValueError as e:
+                print(f"⚠️ {e}")
+    if not symbols:
+        print("❌ Brak lokalnych logo - sprite nie powstał.")
+        return None
+
+    sprite = ('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+              + "".join(symbols.values()) + "</svg>\n")
+    digest = hashlib.sha256(sprite.encode("utf-8")).hexdigest()[:12]
+    sprite_path = os.path.join(sprite_dir, f"logos.{digest}.svg")
+
+    os.makedirs(sprite_dir, exist_ok=True)
+    if not os.path.exists(sprite_path):
+        with open(sprite_path, "w", encoding="utf-8") as f:
+            f.write(sprite)
+    # Stare wersje sprite'a nie są już potrzebne
+    for name in os.listdir(sprite_dir):
+        if name.startswith("logos.") and name.endswith(".svg") and os.path.join(sprite_dir, name) != sprite_path:
+            os.remove(os.path.join(sprite_dir, name))
+
+    manifest = {
+        "sprite": sprite_path.replace(os.sep, "/"),
+        "teams": {abbr: f"team-{logo_key(url)}" for abbr, url in NBA_LOGOS.items() if logo_key(url) in symbols},
+        "default": f"team-{DEFAULT_KEY}" if DEFAULT_KEY in symbols else None,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    print(f"✅ Sprite {sprite_path}: {len(symbols)} logo (z {len(NBA_LOGOS)} skrótów).")
+    return manifest
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+if __name__ == "__main__":
+    vendor_logos()
+    build_sprite()
@@ -0,0 +1,95 @@
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# ==========================================
+# ⏱️ METRYKI PRZEBIEGU
+# ==========================================
+# Czas (wall + CPU wątku) każdego etapu, liczniki (mecze, błędy, bajty) i opcjonalny profil cProfile.
+# Po każdym przebiegu: METRICS_PATH (ostatni przebieg) + linia w METRICS_HISTORY (do śledzenia regresji).
+METRICS_PATH = os.environ.get("NBA_METRICS", "metrics.json")
+METRICS_HISTORY = os.path.join(os.environ.get("NBA_CACHE_DIR", ".cache"), "metrics_history.ndjson")
+
+class RunMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        # Etapy z kilku wątków (np. pobieranie dni) sumują się; CPU liczone per wątek
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                s = self.stages.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'calls': 0})
+                s['wall_s'] += wall
+                s['cpu_s'] += cpu
+                s['calls'] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        return {
+            'run': self.name,
+            'started': self.started,
+            'wall_s': round(time.perf_counter() - self.start_wall, 4),
+            'cpu_s': round(time.process_time() - self.start_cpu, 4),
+            'stages': {k: {'wall_s': round(v['wall_s'], 4), 'cpu_s': round(v['cpu_s'], 4), 'calls': v['calls']}
+                       for k, v in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+    def write(self, path=METRICS_PATH, history=METRICS_HISTORY):
+        data = self.to_dict()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.makedirs(os.path.dirname(history) or ".", exist_ok=True)
+        with open(history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n")
+        slowest = sorted(data['stages'].items(), key=lambda kv: -kv[1]['wall_s'])[:3]
+        summary = ", ".join(f"{k} {v['wall_s']:.2f}s" for k, v in slowest)
+        print(f"⏱️ Przebieg {data['wall_s']:.2f} s ({summary}) -> {path}")
+        return data
+
+# Bieżący przebieg - moduły etapów zapisują do niego bez przekazywania obiektu
+current = RunMetrics("idle")
+
+def start_run(name):
+    global current
+    current = RunMetrics(name)
+    return current
+
+def stage(name):
+    return current.stage(name)
+
+def count(name, n=1):
+    current.count(name, n)
+
+@contextmanager
+def profiled(path=None):
+    # --profile PLIK: cProfile całego przebiegu, wynik do obejrzenia przez `python -m pstats PLIK`
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"🔬 Profil zapisany do {path}")
@@ -0,0 +1,151 @@
+import math
+from contextlib import closing
+from itertools import groupby
+
+import numpy as np
+
+import nba_store
+
+# ==========================================
+# 📈 MODEL ELO (NumPy, wektorowo)
+# ==========================================
+# Ratingi drużyn trzymane w tablicy indeksowanej numerem drużyny. Mecze jednego dnia są
+# niezależne (każda drużyna gra max raz), więc cały dzień aktualizujemy jedną operacją,
+# a prognozę dla całego zestawu meczów liczymy jednym wywołaniem predict().
+ELO_BASE = 1500.0
+ELO_K = 20.0
+HOME_ADV = 100.0           # przewaga parkietu w punktach Elo (~3.5 pkt w meczu)
+SEASON_CARRYOVER = 0.75    # na start sezonu rating wraca w 1/4 do średniej
+RECORD_PRIOR_GAMES = 5     # wygładzenie bilansu przy starcie z pustą historią
+
+# Model na żywo: wynik końcowy ~ N(obecna przewaga + przewaga przedmeczowa * pozostała część meczu,
+# MARGIN_SD^2 * pozostała część meczu)
+MARGIN_SD = 13.0           # odchylenie standardowe różnicy punktów w całym meczu
+GAME_SECONDS = 48 * 60
+PROBIT_SCALE = 1.702       # logistyczne przybliżenie dystrybuanty rozkładu normalnego (błąd < 0.01)
+
+# ESPN i NBA używają różnych skrótów tej samej drużyny
+TEAM_ALIASES = {'GSW': 'GS', 'NOP': 'NO', 'NYK': 'NY', 'SAS': 'SA', 'WAS': 'WSH', 'UTA': 'UTAH', 'PHO': 'PHX'}
+
+def canonical(abbr):
+    return TEAM_ALIASES.get(abbr, abbr)
+
+def parse_record(record_str):
+    try:
+        w, l = map(int, record_str.split('-'))
+        return w, l
+    except (AttributeError, ValueError):
+        return 0, 0
+
+def win_prob(rating_diff):
+    return 1.0 / (1.0 + np.power(10.0, -np.asarray(rating_diff, dtype=float) / 400.0))
+
+def live_win_prob(margin, seconds_left, pregame_prob):
+    """Szansa gospodarzy w trakcie meczu - dla wszystkich trwających meczów naraz.
+    margin: przewaga gospodarzy, seconds_left: czas do końca, pregame_prob: prognoza sprzed meczu."""
+    margin = np.asarray(margin, dtype=float)
+    left = np.asarray(seconds_left, dtype=float) / GAME_SECONDS
+    p = np.clip(np.asarray(pregame_prob, dtype=float), 1e-6, 1 - 1e-6)
+    # Oczekiwana przewaga na cały mecz dobrana tak, żeby przed pierwszym gwizdkiem wyjść z prognozy modelu
+    edge = MARGIN_SD * np.log(p / (1 - p)) / PROBIT_SCALE
+    mean = margin + edge * left
+    sd = MARGIN_SD * np.sqrt(left)
+    # Koniec czasu: rozstrzyga sam wynik (remis -> dogrywka, 50%)
+    z = np.where(sd > 0, mean / np.where(sd > 0, sd, 1.0), np.sign(mean) * 40.0)
+    return 1.0 / (1.0 + np.exp(-PROBIT_SCALE * np.clip(z, -40.0, 40.0)))
+
+class EloModel:
+    def __init__(self, k=ELO_K, home_adv=HOME_ADV, carryover=SEASON_CARRYOVER):
+        self.k = k
+        self.home_adv = home_adv
+        self.carryover = carryover
+        self.teams = {}
+        self.ratings = np.empty(0)
+        self.played = np.empty(0, dtype=np.int64)
+        self.season = None
+        self.applied = set()
+
+    def ids(self, abbrs):
+        # Numery drużyn (nowe drużyny dostają rating bazowy)
+        out = np.empty(len(abbrs), dtype=np.int64)
+        for i, abbr in enumerate(abbrs):
+            abbr = canonical(abbr)
+            idx = self.teams.get(abbr)
+            if idx is None:
+                idx = self.teams[abbr] = len(self.teams)
+            out[i] = idx
+        grow = len(self.teams) - len(self.ratings)
+        if grow > 0:
+            self.ratings = np.concatenate([self.ratings, np.full(grow, ELO_BASE)])
+            self.played = np.concatenate([self.played, np.zeros(grow, dtype=np.int64)])
+        return out
+
+    def new_season(self, season):
+        if self.season is not None and season != self.season:
+            self.ratings = ELO_BASE + self.carryover * (self.ratings - ELO_BASE)
+            self.played[:] = 0
+        self.season = season
+
+    def seed_from_records(self, abbrs, records):
+        # Drużyny bez żadnego meczu w modelu startują z ratingu wyliczonego z bilansu W-L
+        idx = self.ids(abbrs)
+        for i, record in zip(idx, records):
+            if self.played[i] == 0:
+                w, l = parse_record(record)
+                if w + l:
+                    self.ratings[i] = ELO_BASE + 400.0 * math.log10((w + RECORD_PRIOR_GAMES) / (l + RECORD_PRIOR_GAMES))
+
+    def predict(self, home, away):
+        """Prawdopodobieństwo wygranej gospodarzy dla całego zestawu meczów naraz."""
+        h, a = self.ids(home), self.ids(away)
+        return win_prob(self.ratings[h] + self.home_adv - self.ratings[a])
+
+    def update(self, home, away, home_score, away_score):
+        """Aktualizacja po zestawie wyników (np. jeden dzień) - jedna operacja wektorowa.
+        Mnożnik za różnicę punktów jak w modelu FiveThirtyEight."""
+        h, a = self.ids(home), self.ids(away)
+        margin = np.asarray(home_score, dtype=float) - np.asarray(away_score, dtype=float)
+        diff = self.ratings[h] + self.home_adv - self.ratings[a]
+        expected = win_prob(diff)
+        outcome = (margin > 0).astype(float)
+        winner_diff = np.where(margin > 0, diff, -diff)
+        mult = (np.abs(margin) + 3.0) ** 0.8 / (7.5 + 0.006 * winner_diff)
+        delta = self.k * mult * (outcome - expected)
+        np.add.at(self.ratings, h, delta)
+        np.add.at(self.ratings, a, -delta)
+        np.add.at(self.played, h, 1)
+        np.add.at(self.played, a, 1)
+
+    def fit(self, finals):
+        """Przyrostowo dokłada wyniki (wiersze z bazy, posortowane po dacie), pomijając już uwzględnione."""
+        fresh = [r for r in finals if r['espn_id'] not in self.applied]
+        for (season, _day), rows in groupby(fresh, key=lambda r: (r['season'], r['game_date'])):
+            rows = list(rows)
+            self.new_season(season)
+            self.update(
+                [r['home_abbr'] for r in rows], [r['away_abbr'] for r in rows],
+                [r['home_score'] for r in rows], [r['away_score'] for r in rows],
+            )
+            self.applied.update(r['espn_id'] for r in rows)
+        return len(fresh)
+
+    def rating(self, abbr):
+        return float(self.ratings[self.ids([abbr])[0]])
+
+def finals_from_store(conn, before=None):
+    sql = "SELECT * FROM games WHERE state = 'post'"
+    params = ()
+    if before:
+        sql += " AND game_date < ?"
+        params = (before,)
+    return conn.execute(sql + " ORDER BY season, game_date, espn_id", params).fetchall()
+
+def load_model(before=None, path=None):
+    # Model odtwarzany z bazy historycznej (wyniki sprzed dnia `before`, żeby nie podglądać przyszłości)
+    model = EloModel()
+    try:
+        with closing(nba_store.connect(path)) as conn:
+            model.fit(finals_from_store(conn, before))
+    except Exception as e:
+        print(f"⚠️ Nie udało się wczytać historii do modelu Elo: {e}")
+    return model
@@ -0,0 +1,285 @@
+import hashlib
+import os
+
+# ==========================================
+# 🖨️ RENDERER HTML (szablony kompilowane raz, zapis strumieniowy)
+# ==========================================
+# Szablony są stałymi modułu, a ich metody .format są wiązane jednorazowo przy imporcie.
+# Strona nie jest sklejana w pamięci: generator oddaje kolejne fragmenty,
+# które trafiają prosto do buforowanego pliku.
+
+PAGE_HEAD = """
+    <!DOCTYPE html>
+    <html lang="pl">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>NBA PUBLIC SCOREBOARD</title>
+        <link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>🏀</text></svg>">
+        <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;800;900&display=swap" rel="stylesheet">
+        <style>
+            :root { 
+                --bg: #0f172a; 
+                --card-bg: #1e293b; 
+                --accent: #3b82f6; 
+                --text: #f8fafc; 
+                --subtext: #94a3b8;
+                --win: #10b981; 
+                --loss: #ef4444; 
+                --border: #334155; 
+            }
+            
+            body { background-color: var(--bg); color: var(--text); font-family: 'Montserrat', sans-serif; margin: 0; padding: 20px; }
+            .container { max-width: 1200px; margin: 0 auto; }
+            
+            header { text-align: center; margin-bottom: 40px; padding-bottom: 20px; border-bottom: 1px solid var(--border); }
+            h1 { font-weight: 900; letter-spacing: -1px; margin: 0; color: var(--accent); font-size: 2.5rem; }
+            .subtitle { color: var(--subtext); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px; margin-top: 10px; }
+            
+            .grid {
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(450px, 1fr));
+                gap: 25px;
+            }
+            
+            .card { 
+                background: var(--card-bg); 
+                border: 1px solid var(--border); 
+                border-radius: 20px;
+                overflow: hidden; 
+                display: flex; 
+                flex-direction: column;
+                transition: transform 0.2s, box-shadow 0.2s;
+                box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.2);
+            }
+            
+            .card:hover { transform: translateY(-5px); box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.3); border-color: var(--accent); }
+            
+            .card-header { 
+                background: rgba(0,0,0,0.3); 
+                padding: 12px 25px; 
+                display: flex; 
+                justify-content: center; 
+                align-items: center; 
+                border-bottom: 1px solid var(--border);
+                position: relative; z-index: 2;
+            }
+            
+            .status { font-size: 0.75rem; font-weight: 900; color: var(--subtext); text-transform: uppercase; letter-spacing: 1px; }
+            .live { color: #ef4444; animation: pulse 1.5s infinite; }
+            
+            .matchup { 
+                display: flex; 
+                justify-content: space-between; 
+                align-items: center; 
+                padding: 30px 20px; 
+                position: relative;
+                flex-grow: 1;
+            }
+            
+            .team { 
+                text-align: center; 
+                width: 30%; 
+                height: 140px; 
+                position: relative; 
+                display: flex;
+                justify-content: center;
+                align-items: center;
+            }
+            
+            .team-name { 
+                font-weight: 900; 
+                font-size: 0.85rem; 
+                text-transform: uppercase;
+                letter-spacing: 0.5px;
+                position: absolute; 
+                bottom: 0;
+                left: 50%;
+                transform: translateX(-50%);
+                width: 100%;
+                z-index: 3; 
+                text-shadow: 0 2px 4px rgba(0,0,0,1); 
+                padding-bottom: 5px;
+            }
+            
+            .team-logo {
+                width: 120px;
+                height: 120px;
+                object-fit: contain;
+                z-index: 1;
+                opacity: 0.9; 
+                margin-bottom: 15px; 
+            }
+            
+            .score-container {
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                gap: 15px;
+                position: relative; z-index: 2;
+            }
+            
+            .score { font-size: 2.8rem; font-weight: 900; line-height: 1; text-shadow: 0 2px 5px rgba(0,0,0,0.8); }
+            .score.winner { color: var(--win); }
+            .score.loser { color: var(--subtext); opacity: 0.8; }
+            
+            .vs-sep { color: var(--border); font-style: italic; font-weight: 900; font-size: 1.5rem; }
+            
+            .prediction-box { 
+                background: rgba(15, 23, 42, 0.6);
+                padding: 20px; 
+                text-align: center; 
+                border-top: 1px solid var(--border); 
+                margin-top: auto;
+                position: relative; z-index: 2;
+            }
+            
+            .pred-label { font-size: 0.7rem; color: var(--subtext); text-transform: uppercase; font-weight: 700; letter-spacing: 1px; margin-bottom: 8px; }
+            .pred-val { font-size: 1.2rem; font-weight: 900; color: var(--text); display: flex; align-items: center; justify-content: center; gap: 8px; }
+            .pred-prob { font-size: 0.85rem; font-weight: 700; color: var(--accent); }
+            .live-prob { font-size: 0.75rem; font-weight: 900; color: var(--loss); letter-spacing: 0.5px; }
+            
+            .archive-nav { text-align: center; margin-top: 40px; }
+            .archive-nav h2 { font-weight: 900; margin: 0 0 10px; }
+            .archive-nav a, .archive-table a { color: var(--accent); text-decoration: none; margin: 0 8px; }
+            .archive-table { width: 100%; border-collapse: collapse; margin-top: 30px; font-size: 0.9rem; }
+            .archive-table th, .archive-table td { padding: 8px 12px; border-bottom: 1px solid var(--border); text-align: left; }
+            .archive-table th { color: var(--subtext); text-transform: uppercase; font-size: 0.7rem; letter-spacing: 1px; }
+            
+            .footer { text-align: center; color: var(--subtext); font-size: 0.75rem; margin-top: 50px; padding-bottom: 20px; }
+            @keyframes pulse { 0% { opacity: 1; } 50% { opacity: 0.5; } 100% { opacity: 1; } }
+            @media (max-width: 768px) { .grid { grid-template-columns: 1fr; } .matchup { padding: 25px 15px; } .score { font-size: 2.2rem; } }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <header>
+                <h1>NBA PUBLIC HUB</h1>
+                <div class="subtitle">Live Scores & Automated Models</div>
+            </header>
+            <div class="grid">
+    """
+
+CARD_TEMPLATE = """
+            <div class="card">
+                <div class="card-header">
+                    <span class="{status_class}">{status_text}</span>
+                </div>
+                <div class="matchup">
+                    <div class="team">
+                        {a_logo_html}
+                        <span class="team-name">{a_name}</span>
+                    </div>
+                    <div class="score-container">
+                        {score_display_html}
+                    </div>
+                    <div class="team">
+                        {h_logo_html}
+                        <span class="team-name">{h_name}</span>
+                    </div>
+                </div>
+                <div class="prediction-box">
+                    <div class="pred-label">Prognoza Modelu Publicznego</div>
+                    <div class="pred-val">{prediction_content}</div>
+                </div>
+            </div>
+            """
+
+SCORE_TEMPLATE = """
+                    <span class="{a_score_class}">{a_score}</span>
+                    <span class="vs-sep">:</span>
+                    <span class="{h_score_class}">{h_score}</span>
+                """
+
+LOGO_IMG_TEMPLATE = '<img src="{url}" class="team-logo" alt="{name}">'
+LOGO_USE_TEMPLATE = '<svg class="team-logo" role="img" aria-label="{name}"><use href="{sprite}#{symbol}"></use></svg>'
+
+VS_HTML = '<span class="vs-sep" style="font-size: 2rem;">VS</span>'
+
+EMPTY_SLATE = "<p style='text-align:center; color:#888;'>Brak meczów w harmonogramie ESPN.</p>"
+
+# Zamknięcie siatki kart - między nim a stopką trafia ewentualny blok audytu Gemini
+GRID_END = """
+            </div>
+            """
+
+# Archiwum: nawigacja (tytuł + linki) i tabele indeksów sezonu/drużyny
+ARCHIVE_NAV_TEMPLATE = """
+            <nav class="archive-nav">
+                <h2>{title}</h2>
+                {links}
+            </nav>
+            """
+ARCHIVE_LINK_TEMPLATE = '<a href="{href}">{label}</a>'
+ARCHIVE_TABLE_TEMPLATE = """
+            <table class="archive-table">
+                <thead><tr>{head}</tr></thead>
+                <tbody>{rows}</tbody>
+            </table>
+            """
+
+PAGE_FOOTER_TEMPLATE = """<div class="footer">
+                Automatyczna aktualizacja: {updated} | Data Source: ESPN
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+render_card_html = CARD_TEMPLATE.format
+render_logo_img = LOGO_IMG_TEMPLATE.format
+render_logo_use = LOGO_USE_TEMPLATE.format
+render_score_html = SCORE_TEMPLATE.format
+render_footer = PAGE_FOOTER_TEMPLATE.format
+render_archive_nav = ARCHIVE_NAV_TEMPLATE.format
+render_archive_link = ARCHIVE_LINK_TEMPLATE.format
+render_archive_table = ARCHIVE_TABLE_TEMPLATE.format
+
+WRITE_BUFFER = 1 << 16
+
+# Bezpiecznik: index.html większy niż limit (domyślnie 2 MB) nie zastępuje poprzedniej wersji
+MAX_HTML_BYTES = int(os.environ.get("AUDIT_MAX_HTML_BYTES", 2_000_000))
+
+def iter_page_body(cards):
+    # Nagłówek + karty (dowolny iterator fragmentów) - bez stopki, żeby hash nie zależał od czasu
+    yield PAGE_HEAD
+    count = 0
+    for card_html in cards:
+        yield card_html
+        count += 1
+    if count == 0:
+        yield EMPTY_SLATE
+    yield GRID_END
+
+def write_page(path, body, footer, previous_hash=None, max_bytes=None):
+    """Strumieniowo zapisuje body + footer do pliku tymczasowego, licząc po drodze hash body.
+    Jeśli hash jest równy previous_hash (a plik istnieje), plik docelowy zostaje nietknięty.
+    Strona większa niż max_bytes nie jest zapisywana (zwraca previous_hash).
+    Zwraca (page_hash, zapisano)."""
+    digest = hashlib.sha256()
+    tmp = path + ".tmp"
+    size = 0
+    with open(tmp, "wb", buffering=WRITE_BUFFER) as f:
+        for fragment in body:
+            chunk = fragment.encode("utf-8")
+            digest.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+        chunk = footer.encode("utf-8")
+        f.write(chunk)
+        size += len(chunk)
+
+    if max_bytes is not None and size > max_bytes:
+        os.remove(tmp)
+        print(f"❌ {path} miałby {size} B (limit {max_bytes} B) - pomijam zapis.")
+        return previous_hash, False
+
+    page_hash = digest.hexdigest()
+    if page_hash == previous_hash and os.path.exists(path):
+        os.remove(tmp)
+        return page_hash, False
+    os.replace(tmp, path)
+    return page_hash, True
+
+def table_row(cells, tag="td"):
+    return "<tr>" + "".join(f"<{tag}>{cell}</{tag}>" for cell in cells) + "</tr>"
@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+import nba_games
+import nba_model
+import update_nba
+
+# ==========================================
+# 🎲 SYMULACJA MONTE CARLO SEZONU I PLAYOFFÓW
+# ==========================================
+# Aktualne bilanse (z danych ESPN) + pozostały terminarz + prawdopodobieństwa z modelu Elo.
+# Wszystkie symulacje jednej paczki to jedna macierz losowań [symulacje x mecze]; wygrane drużyn
+# liczy jedno mnożenie macierzy, miejsca w konferencji - argsort po osi drużyn.
+# Prawdopodobieństwa są stałe w trakcie symulacji (bez aktualizacji ratingów po losowanych meczach).
+SIMS = 100_000
+SIM_CHUNK = 10_000          # symulacje w jednej paczce (pamięć: paczka x mecze bajtów)
+TIEBREAK_NOISE = 0.5        # remisy w bilansie rozstrzygane losowo (bez pełnych tie-breakerów NBA)
+REGULAR_SEASON_END = (4, 15)
+# Bilanse bierzemy też z ostatnich dni - drużyna bez meczu w pozostałym terminarzu (koniec sezonu)
+# ma bilans z ostatniego rozegranego meczu. Dłużej niż przerwa na Mecz Gwiazd.
+RECORD_LOOKBACK_DAYS = 14
+SIM_CACHE = os.path.join(update_nba.CACHE_DIR, "season_sim.json")
+
+PLAYOFF_SEEDS = 6           # miejsca 1-6: bezpośrednio w playoffach
+PLAY_IN_SEEDS = (7, 10)     # miejsca 7-10: turniej play-in o miejsca 7 i 8
+
+CONFERENCES = {
+    'East': ('ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DET', 'IND', 'MIA', 'MIL', 'NY', 'ORL', 'PHI', 'TOR', 'WSH'),
+    'West': ('DAL', 'DEN', 'GS', 'HOU', 'LAC', 'LAL', 'MEM', 'MIN', 'NO', 'OKC', 'PHX', 'POR', 'SA', 'SAC', 'UTAH'),
+}
+TEAMS = tuple(abbr for teams in CONFERENCES.values() for abbr in teams)
+CONF_SIZE = len(CONFERENCES['East'])
+
+@dataclass
+class SimInputs:
+    season: int
+    base_wins: np.ndarray       # [drużyny] - wygrane do tej pory
+    base_losses: np.ndarray
+    home: np.ndarray            # [mecze] - numery drużyn w TEAMS
+    away: np.ndarray
+    p_home: np.ndarray          # [mecze] - prawdopodobieństwo wygranej gospodarzy
+    ratings: np.ndarray         # [drużyny] - ratingi Elo (mecze play-in)
+    game_ids: list
+
+    def key(self, sims, seed):
+        # Zmienia się, gdy dojdą nowe wyniki (bilanse, krótszy terminarz) albo ustawienia symulacji
+        payload = [self.season, self.base_wins.tolist(), self.base_losses.tolist(), self.game_ids,
+                   np.round(self.p_home, 4).tolist(), sims, seed]
+        return hashlib.sha1(json.dumps(payload).encode("utf-8")).hexdigest()
+
+def season_end(season):
+    return date(season, *REGULAR_SEASON_END)
+
+def load_inputs(today=None, until=None):
+    """Bilanse z ostatnich RECORD_LOOKBACK_DAYS dni + terminarz od dziś do końca sezonu zasadniczego
+    z ESPN (przez cache scoreboardów) + model Elo. Bez danych z ESPN zwraca None."""
+    today = today or date.today()
+    season = nba_games.season_of_day(today.isoformat())
+    end = until or season_end(season)
+    events = update_nba.fetch_scoreboards(min(today, end) - timedelta(days=RECORD_LOOKBACK_DAYS), end)
+    if events is None:
+        print("❌ Brak danych z ESPN - symulacja bez bilansów i terminarza nie ma sensu, przerywam.")
+        return None
+
+    team_idx = {abbr: i for i, abbr in enumerate(TEAMS)}
+    records, remaining = {}, []
+    for _, game, _ in nba_games.parse_events(events):
+        if game is None or game.season_type != 2:
+            continue
+        h, a = team_idx.get(nba_model.canonical(game.home.abbr)), team_idx.get(nba_model.canonical(game.away.abbr))
+        if h is None or a is None:
+            continue  # Mecz Gwiazd, drużyny spoza NBA
+        # Najświeższy bilans drużyny = ten z największą liczbą rozegranych meczów
+        for i, record in ((h, game.home.record), (a, game.away.record)):
+            w, l = nba_model.parse_record(record)
+            if w + l >= sum(records.get(i, (0, 0))):
+                records[i] = (w, l)
+        if game.state != 'post':
+            remaining.append((game.id, h, a))
+
+    missing = [TEAMS[i] for i in range(len(TEAMS)) if i not in records]
+    if missing and remaining:
+        print(f"⚠️ Brak bilansu (0-0) dla: {', '.join(missing)}")
+
+    base = np.array([records.get(i, (0, 0)) for i in range(len(TEAMS))], dtype=np.int64)
+    model = nba_model.load_model(before=today.isoformat())
+    model.seed_from_records(TEAMS, [f"{w}-{l}" for w, l in base])
+    home = np.array([h for _, h, _ in remaining], dtype=np.int64)
+    away = np.array([a for _, _, a in remaining], dtype=np.int64)
+    teams = np.array(TEAMS)
+    p_home = model.predict(teams[home].tolist(), teams[away].tolist()) if remaining else np.empty(0)
+    ratings = model.ratings[model.ids(TEAMS)]
+    return SimInputs(season, base[:, 0], base[:, 1], home, away, np.asarray(p_home, dtype=float), ratings,
+                     [game_id for game_id, _, _ in remaining])
+
+def _play(rng, ratings, home, away):
+    # Jeden mecz play-in w każdej symulacji naraz (gospodarzem wyżej rozstawiony)
+    p = nba_model.win_prob(ratings[home] + nba_model.HOME_ADV - ratings[away])
+    won = rng.random(len(home)) < p
+    return np.where(won, home, away), np.where(won, away, home)
+
+def simulate_chunk(inputs, sims, seed, chunk=SIM_CHUNK):
+    """Sumy z `sims` symulacji: wygrane, rozkład miejsc w konferencji, playoffy, play-in."""
+    rng = np.random.default_rng(seed)
+    n_teams = len(TEAMS)
+    # wygrane = bilans + wszystkie mecze wyjazdowe + wygrane gospodarzy x (gospodarz - gość)
+    swing = np.zeros((len(inputs.home), n_teams), dtype=np.float32)
+    swing[np.arange(len(inputs.home)), inputs.home] += 1
+    swing[np.arange(len(inputs.away)), inputs.away] -= 1
+    start_wins = (inputs.base_wins + np.bincount(inputs.away, minlength=n_teams)).astype(np.float32)
+    p_home = inputs.p_home.astype(np.float32)
+
+    wins_sum = np.zeros(n_teams)
+    seeds = np.zeros((n_teams, CONF_SIZE), dtype=np.int64)
+    playoff = np.zeros(n_teams, dtype=np.int64)
+    play_in = np.zeros(n_teams, dtype=np.int64)
+
+    done = 0
+    while done < sims:
+        m = min(chunk, sims - done)
+        done += m
+        home_won = (rng.random((m, len(p_home)), dtype=np.float32) < p_home).astype(np.float32)
+        wins = start_wins + home_won @ swing
+        wins_sum += wins.sum(axis=0)
+
+        for conf in range(len(CONFERENCES)):
+            idx = np.arange(conf * CONF_SIZE, (conf + 1) * CONF_SIZE)
+            noisy = wins[:, idx] + rng.random((m, CONF_SIZE), dtype=np.float32) * TIEBREAK_NOISE
+            order = idx[np.argsort(-noisy, axis=1)]        # order[:, k] = drużyna na miejscu k+1
+            for k in range(CONF_SIZE):
+                seeds[:, k] += np.bincount(order[:, k], minlength=n_teams)
+
+            lo, hi = PLAY_IN_SEEDS
+            playoff += np.bincount(order[:, :PLAYOFF_SEEDS].ravel(), minlength=n_teams)
+            play_in += np.bincount(order[:, lo - 1:hi].ravel(), minlength=n_teams)
+            seed7, loser78 = _play(rng, inputs.ratings, order[:, 6], order[:, 7])
+            winner910, _ = _play(rng, inputs.ratings, order[:, 8], order[:, 9])
+            seed8, _ = _play(rng, inputs.ratings, loser78, winner910)
+            playoff += np.bincount(seed7, minlength=n_teams) + np.bincount(seed8, minlength=n_teams)
+
+    return {'sims': sims, 'wins': wins_sum, 'seeds': seeds, 'playoff': playoff, 'play_in': play_in}
+
+def simulate(inputs, sims=SIMS, seed=None, workers=1):
+    # workers > 1: symulacje dzielone między procesy, każdy z własnym, niezależnym strumieniem losowań
+    parts = max(1, min(workers or 1, sims))
+    sizes = [sims // parts + (i < sims % parts) for i in range(parts)]
+    streams = np.random.SeedSequence(seed).spawn(parts)
+    if parts == 1:
+        results = [simulate_chunk(inputs, sizes[0], streams[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=parts) as pool:
+            results = list(pool.map(simulate_chunk, [inputs] * parts, sizes, streams))
+    total = {k: sum(r[k] for r in results) for k in results[0]}
+
+    n = total['sims']
+    games_left = np.bincount(inputs.home, minlength=len(TEAMS)) + np.bincount(inputs.away, minlength=len(TEAMS))
+    teams = []
+    for conf, abbrs in CONFERENCES.items():
+        for abbr in abbrs:
+            i = TEAMS.index(abbr)
+            proj_wins = total['wins'][i] / n
+            teams.append({
+                'abbr': abbr,
+                'conference': conf,
+                'wins': int(inputs.base_wins[i]),
+                'losses': int(inputs.base_losses[i]),
+                'proj_wins': round(proj_wins, 1),
+                'proj_losses': round(inputs.base_wins[i] + inputs.base_losses[i] + games_left[i] - proj_wins, 1),
+                'playoff': round(total['playoff'][i] / n, 4),
+                'play_in': round(total['play_in'][i] / n, 4),
+                'seeds': [round(c / n, 4) for c in total['seeds'][i]],
+            })
+    return {'season': inputs.season, 'sims': n, 'games_left': len(inputs.home),
+            'generated': datetime.now(timezone.utc).isoformat(timespec="seconds"), 'teams': teams}
+
+def cached_simulate(inputs, sims=SIMS, seed=None, workers=1, path=SIM_CACHE):
+    # Wynik trzymany do czasu nowych wyników (klucz z bilansów i terminarza); losowy seed = bez cache
+    key = inputs.key(sims, seed) if seed is not None else None
+    if key:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                print("♻️ Symulacja z cache (brak nowych wyników).")
+                return cached['result']
+        except (OSError, ValueError):
+            pass
+    result = simulate(inputs, sims, seed, workers)
+    if key:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({'key': key, 'result': result}, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+    return result
+
+def print_table(result):
+    print(f"🎲 Sezon {result['season']}: {result['sims']:,} symulacji, {result['games_left']} meczów do końca.")
+    for conf in CONFERENCES:
+        print(f"\n{conf:<6} {'bilans':>7} {'proj.':>11} {'playoff':>8} {'play-in':>8}  najczęstsze miejsce")
+        rows = sorted((t for t in result['teams'] if t['conference'] == conf), key=lambda t: -t['proj_wins'])
+        for t in rows:
+            best = int(np.argmax(t['seeds']))
+            print(f"{t['abbr']:<6} {t['wins']:>3}-{t['losses']:<3} {t['proj_wins']:>5.1f}-{t['proj_losses']:<5.1f}"
+                  f" {t['playoff']:>8.1%} {t['play_in']:>8.1%}  {best + 1} ({t['seeds'][best]:.0%})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Symulacja Monte Carlo reszty sezonu NBA")
+    parser.add_argument("--sims", type=int, default=SIMS, help=f"liczba symulacji (domyślnie {SIMS:,})")
+    parser.add_argument("--workers", type=int, default=1, help="procesy do podziału symulacji")
+    parser.add_argument("--seed", type=int, default=0, help="ziarno losowania (-1 = losowe, bez cache)")
+    parser.add_argument("--until", type=date.fromisoformat, help="koniec sezonu zasadniczego (YYYY-MM-DD)")
+    parser.add_argument("--out", metavar="PLIK", help="zapisz wynik jako JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    inputs = load_inputs(until=args.until)
+    if inputs is None:
+        sys.exit(1)
+    result = cached_simulate(inputs, args.sims, None if args.seed < 0 else args.seed, args.workers)
+    print_table(result)
+    print(f"\n⏱️ {time.perf_counter() - start:.2f} s")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
@@ -0,0 +1,206 @@
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+from nba_games import Game, TeamSide
+
+# ==========================================
+# 🗄️ BAZA HISTORYCZNA MECZÓW (SQLite)
+# ==========================================
+# Każdy widziany mecz ESPN: drużyny, wyniki, bilanse z chwili przed meczem, typ modelu i rezultat.
+# Bilanse i typ są aktualizowane tylko dopóki mecz jest w stanie 'pre', żeby ✅/❌
+# odnosiło się do prognozy sprzed meczu, a nie do bilansu już uwzględniającego wynik.
+DB_PATH = os.environ.get("NBA_DB", "nba_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    espn_id          TEXT PRIMARY KEY,
+    game_date        TEXT NOT NULL,
+    season           INTEGER,
+    state            TEXT NOT NULL,
+    status_detail    TEXT,
+    home_abbr        TEXT NOT NULL,
+    away_abbr        TEXT NOT NULL,
+    home_name        TEXT,
+    away_name        TEXT,
+    home_score       INTEGER,
+    away_score       INTEGER,
+    home_record      TEXT,
+    away_record      TEXT,
+    predicted_winner TEXT,
+    home_win_prob    REAL,
+    live_home_win_prob REAL,
+    actual_winner    TEXT,
+    updated_at       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games(game_date);
+CREATE INDEX IF NOT EXISTS idx_games_season ON games(season, game_date);
+CREATE INDEX IF NOT EXISTS idx_games_home ON games(home_abbr, game_date);
+CREATE INDEX IF NOT EXISTS idx_games_away ON games(away_abbr, game_date);
+"""
+
+UPSERT = """
+INSERT INTO games (
+    espn_id, game_date, season, state, status_detail, home_abbr, away_abbr, home_name, away_name,
+    home_score, away_score, home_record, away_record, predicted_winner, home_win_prob, live_home_win_prob, actual_winner, updated_at
+) VALUES (
+    :espn_id, :game_date, :season, :state, :status_detail, :home_abbr, :away_abbr, :home_name, :away_name,
+    :home_score, :away_score, :home_record, :away_record, :predicted_winner, :home_win_prob, :live_home_win_prob, :actual_winner, :updated_at
+)
+ON CONFLICT(espn_id) DO UPDATE SET
+    game_date = excluded.game_date,
+    state = excluded.state,
+    status_detail = excluded.status_detail,
+    home_score = excluded.home_score,
+    away_score = excluded.away_score,
+    home_record = CASE WHEN excluded.state = 'pre' THEN excluded.home_record ELSE games.home_record END,
+    away_record = CASE WHEN excluded.state = 'pre' THEN excluded.away_record ELSE games.away_record END,
+    predicted_winner = CASE WHEN excluded.state = 'pre' THEN excluded.predicted_winner ELSE games.predicted_winner END,
+    home_win_prob = CASE WHEN excluded.state = 'pre' THEN excluded.home_win_prob ELSE games.home_win_prob END,
+    live_home_win_prob = excluded.live_home_win_prob,
+    actual_winner = excluded.actual_winner,
+    updated_at = excluded.updated_at
+-- Wiersz bez zmian nie jest dotykany: baza (commitowana przez workflow) zmienia się tylko z wynikami
+WHERE games.game_date IS NOT excluded.game_date
+   OR games.state IS NOT excluded.state
+   OR games.status_detail IS NOT excluded.status_detail
+   OR games.home_score IS NOT excluded.home_score
+   OR games.away_score IS NOT excluded.away_score
+   OR games.live_home_win_prob IS NOT excluded.live_home_win_prob
+   OR games.actual_winner IS NOT excluded.actual_winner
+   OR (excluded.state = 'pre' AND (
+          games.home_record IS NOT excluded.home_record
+       OR games.away_record IS NOT excluded.away_record
+       OR games.predicted_winner IS NOT excluded.predicted_winner
+       OR games.home_win_prob IS NOT excluded.home_win_prob))
+"""
+
+# Kolumny dodane po pierwszej wersji schematu (starsze bazy dostają je przez ALTER TABLE)
+MIGRATIONS = {
+    'home_win_prob': "ALTER TABLE games ADD COLUMN home_win_prob REAL",
+    'live_home_win_prob': "ALTER TABLE games ADD COLUMN live_home_win_prob REAL",
+}
+
+def connect(path=None):
+    conn = sqlite3.connect(path or DB_PATH)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(games)")}
+    for column, ddl in MIGRATIONS.items():
+        if column not in columns:
+            conn.execute(ddl)
+    return conn
+
+def game_row(game):
+    return {
+        'espn_id': game.id,
+        'game_date': game.day,
+        'season': game.season,
+        'state': game.state,
+        'status_detail': game.detail,
+        'home_abbr': game.home.abbr,
+        'away_abbr': game.away.abbr,
+        'home_name': game.home.name,
+        'away_name': game.away.name,
+        'home_score': game.home.score,
+        'away_score': game.away.score,
+        'home_record': game.home.record,
+        'away_record': game.away.record,
+        'predicted_winner': game.winner,
+        'home_win_prob': game.home_prob,
+        'live_home_win_prob': game.live_prob,
+        'actual_winner': game.actual_winner,
+        'updated_at': datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+def game_from_row(row):
+    # Wiersz bazy -> Game (archiwum renderuje karty tym samym kodem co strona dnia)
+    return Game(
+        id=row['espn_id'], date=row['game_date'], day=row['game_date'], season=row['season'],
+        season_type=2, state=row['state'], detail=row['status_detail'] or "",
+        short_detail=row['status_detail'] or "", period=0, clock="",
+        home=TeamSide(row['home_abbr'], row['home_name'], row['home_score'] or 0, row['home_record']),
+        away=TeamSide(row['away_abbr'], row['away_name'], row['away_score'] or 0, row['away_record']),
+        home_prob=row['home_win_prob'], live_prob=row['live_home_win_prob'],
+    )
+
+def upsert_games(conn, rows):
+    with conn:
+        conn.executemany(UPSERT, rows)
+    return len(rows)
+
+def record_games(rows, path=None):
+    with closing(connect(path)) as conn:
+        return upsert_games(conn, rows)
+
+# --- ZAPYTANIA ---
+def season_accuracy(conn, season=None):
+    sql = """
+        SELECT COUNT(*) AS total, COALESCE(SUM(predicted_winner = actual_winner), 0) AS correct
+        FROM games WHERE state = 'post' AND predicted_winner IS NOT NULL
+    """
+    params = ()
+    if season is not None:
+        sql += " AND season = ?"
+        params = (season,)
+    row = conn.execute(sql, params).fetchone()
+    total, correct = row['total'], row['correct']
+    return correct, total, (correct / total if total else 0.0)
+
+def team_history(conn, abbr, limit=None):
+    sql = """
+        SELECT * FROM games WHERE home_abbr = :abbr
+        UNION ALL
+        SELECT * FROM games WHERE away_abbr = :abbr
+        ORDER BY game_date DESC
+    """
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return conn.execute(sql, {'abbr': abbr}).fetchall()
+
+def games_between(conn, start, end):
+    return conn.execute(
+        "SELECT * FROM games WHERE game_date BETWEEN ? AND ? ORDER BY game_date, espn_id",
+        (start, end),
+    ).fetchall()
+
+def seasons(conn):
+    return [row['season'] for row in conn.execute("SELECT DISTINCT season FROM games ORDER BY season")]
+
+def season_games(conn, season):
+    return conn.execute(
+        "SELECT * FROM games WHERE season = ? ORDER BY game_date, espn_id", (season,),
+    ).fetchall()
+
+def _print_games(rows):
+    for r in rows:
+        icon = ""
+        if r['state'] == 'post' and r['predicted_winner']:
+            icon = " ✅" if r['predicted_winner'] == r['actual_winner'] else " ❌"
+        print(f"{r['game_date']}  {r['away_abbr']:>4} {r['away_score']:>3} @ {r['home_abbr']:<4} {r['home_score']:>3}"
+              f"  typ: {r['predicted_winner']}{icon}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zapytania do bazy historycznej meczów NBA")
+    parser.add_argument("--db", default=None, help=f"plik bazy (domyślnie {DB_PATH})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    acc = sub.add_parser("accuracy", help="skuteczność typów modelu")
+    acc.add_argument("--season", type=int)
+    team = sub.add_parser("team", help="historia meczów drużyny")
+    team.add_argument("abbr")
+    team.add_argument("--limit", type=int, default=20)
+    rng = sub.add_parser("range", help="mecze z zakresu dat (YYYY-MM-DD)")
+    rng.add_argument("start")
+    rng.add_argument("end")
+    args = parser.parse_args()
+
+    with closing(connect(args.db)) as conn:
+        if args.cmd == "accuracy":
+            correct, total, pct = season_accuracy(conn, args.season)
+            print(f"🎯 Skuteczność: {correct}/{total} ({pct:.1%})")
+        elif args.cmd == "team":
+            _print_games(team_history(conn, args.abbr.upper(), args.limit))
+        else:
+            _print_games(games_between(conn, args.start, args.end))
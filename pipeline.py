@@ -0,0 +1,28 @@
+import argparse
+from functools import partial
+
+import gemini_audit
+import update_nba
+
+# ==========================================
+# 🔗 PIPELINE: fetch -> predict -> render -> audit w jednym procesie
+# ==========================================
+# Typy trafiają do audytu jako obiekty w pamięci, audyt Gemini (sieć) biegnie w tle
+# równolegle z renderowaniem kart, a index.html jest zapisywany raz - razem z raportem.
+# Pliki propozycje_typow.txt / finalny_raport_dnia.txt są już tylko opcjonalnym eksportem.
+
+def run_pipeline(days_back=0, days_ahead=0, audit=True, export_picks=False, export_report=False, profile=None):
+    auditor = partial(gemini_audit.build_audit_block, export_report=export_report) if audit else None
+    return update_nba.generate_html(days_back, days_ahead, auditor=auditor, export_picks=export_picks,
+                                    profile=profile, run_name="pipeline")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NBA Update Bot + audyt Gemini w jednym przebiegu")
+    parser.add_argument("--days-back", type=int, default=0, help="ile dni wstecz pobrać (np. wczorajsze wyniki)")
+    parser.add_argument("--days-ahead", type=int, default=0, help="ile dni do przodu pobrać (harmonogram)")
+    parser.add_argument("--no-audit", action="store_true", help="pomiń audyt Gemini")
+    parser.add_argument("--export-picks", action="store_true", help="zapisz typy do propozycje_typow.txt")
+    parser.add_argument("--export-report", action="store_true", help="zapisz raport do finalny_raport_dnia.txt")
+    parser.add_argument("--profile", metavar="PLIK", help="zapisz profil cProfile przebiegu (np. run.pstats)")
+    args = parser.parse_args()
+    run_pipeline(args.days_back, args.days_ahead, not args.no_audit, args.export_picks, args.export_report, args.profile)
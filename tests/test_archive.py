@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+import nba_archive
+import nba_store
+from nba_games import Game, TeamSide
+
+TEAMS = {'BOS': 'Celtics', 'LAL': 'Lakers', 'MIA': 'Heat', 'NYK': 'Knicks', 'DEN': 'Nuggets', 'PHX': 'Suns'}
+
+def game(game_id, day, home, away, home_score=110, away_score=100):
+    return Game(id=game_id, date=f"{day}T23:30Z", day=day, season=2026, season_type=2,
+                state='post', detail='Final', short_detail='Final', period=4, clock='0:00',
+                home=TeamSide(home, TEAMS[home], home_score, '10-5'),
+                away=TeamSide(away, TEAMS[away], away_score, '8-7'), home_prob=0.6)
+
+SLATE = [
+    game('1', '2026-01-17', 'BOS', 'LAL'),
+    game('2', '2026-01-17', 'MIA', 'NYK', 95, 101),
+    game('3', '2026-01-18', 'BOS', 'MIA'),
+    game('4', '2026-01-18', 'DEN', 'PHX'),
+]
+
+@pytest.fixture
+def store(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    nba_store.record_games([nba_store.game_row(g) for g in SLATE], path)
+    return path
+
+def test_build_archive_pages_and_manifest(store, tmp_path):
+    out = str(tmp_path / "archive")
+    # 2 dni + sezon + 6 drużyn >= POOL_MIN_PAGES -> budowa w puli procesów
+    built = nba_archive.build_archive(out, store, workers=2)
+    expected = {"2026-01-17.html", "2026-01-18.html", "season-2026.html",
+                *(f"team-{abbr}-2026.html" for abbr in TEAMS)}
+    assert set(built) == expected
+    for name in expected:
+        assert os.path.getsize(os.path.join(out, name)) > 0
+
+    with open(os.path.join(out, nba_archive.MANIFEST_NAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest['version'] == nba_archive.ARCHIVE_VERSION
+    assert set(manifest['pages']) == expected
+
+    with open(os.path.join(out, "season-2026.html"), "r", encoding="utf-8") as f:
+        season = f.read()
+    assert 'href="2026-01-17.html"' in season and 'href="team-BOS-2026.html"' in season
+
+def test_rerun_rebuilds_nothing(store, tmp_path):
+    out = str(tmp_path / "archive")
+    nba_archive.build_archive(out, store, workers=1)
+    assert nba_archive.build_archive(out, store, workers=1) == []
+
+def test_new_day_rebuilds_only_affected_pages(store, tmp_path):
+    out = str(tmp_path / "archive")
+    nba_archive.build_archive(out, store, workers=1)
+    nba_store.record_games([nba_store.game_row(game('5', '2026-01-19', 'LAL', 'DEN'))], store)
+    built = nba_archive.build_archive(out, store, workers=1)
+    assert set(built) == {"2026-01-19.html", "season-2026.html", "team-LAL-2026.html", "team-DEN-2026.html"}
+
+def test_missing_page_is_rebuilt(store, tmp_path):
+    out = str(tmp_path / "archive")
+    nba_archive.build_archive(out, store, workers=1)
+    os.remove(os.path.join(out, "2026-01-18.html"))
+    assert nba_archive.build_archive(out, store, workers=1) == ["2026-01-18.html"]
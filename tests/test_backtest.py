@@ -0,0 +1,37 @@
+import json
+
+import nba_backtest
+
+def event(event_id, iso_date, home, away, home_score, away_score):
+    def competitor(abbr, side, score):
+        return {'homeAway': side, 'score': str(score),
+                'team': {'abbreviation': abbr, 'shortDisplayName': abbr}}
+    return {
+        'id': event_id, 'date': iso_date, 'season': {'year': 2026, 'type': 2},
+        'status': {'period': 4, 'displayClock': "0:00",
+                   'type': {'state': 'post', 'detail': "Final", 'shortDetail': "Final"}},
+        'competitions': [{'competitors': [competitor(home, 'home', home_score),
+                                          competitor(away, 'away', away_score)]}],
+    }
+
+def write_day(directory, day, events):
+    path = directory / f"{day}.json"
+    path.write_text(json.dumps({'events': events}), encoding="utf-8")
+    return str(path)
+
+def test_game_on_two_daily_scoreboards_counted_once(tmp_path):
+    # Mecz "2" (start po północy UTC) jest na scoreboardach obu dni
+    late = event("2", "2026-01-18T03:00Z", "LAL", "BOS", 101, 99)
+    paths = [
+        write_day(tmp_path, "20260117", [event("1", "2026-01-18T00:00Z", "BOS", "MIA", 110, 100), late]),
+        write_day(tmp_path, "20260118", [late, event("3", "2026-01-19T00:00Z", "MIA", "LAL", 90, 95)]),
+    ]
+    for spec in nba_backtest.MODELS:
+        result = nba_backtest.backtest_season(spec, 2026, paths)
+        assert result['games'] == 3
+
+def test_load_finals_keeps_event_id(tmp_path):
+    path = write_day(tmp_path, "20260117", [event("1", "2026-01-18T00:00Z", "BOS", "MIA", 110, 100)])
+    assert nba_backtest.load_finals(path) == [
+        {'id': "1", 'home': "BOS", 'away': "MIA", 'home_score': 110, 'away_score': 100},
+    ]
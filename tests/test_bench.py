@@ -0,0 +1,13 @@
+import nba_bench
+import nba_games
+
+def test_synthetic_slate_parses_completely():
+    for day in ("2026-01-17", "2026-07-10"):  # zima i czas letni w ET
+        games, errors = nba_games.parse_scoreboard(nba_bench.synthetic_slate(500, day=day))
+        assert len(games) == 500 and not errors
+        assert {game.day for game in games} == {day}
+
+def test_compare_checks_only_metrics_in_baseline():
+    now = {'synthetic-15': {'render': {'wall_s': 9.0, 'items_per_s': 1.0, 'peak_kb': 9999.0, 'bytes': 100}}}
+    assert nba_bench.compare(now, {'synthetic-15': {'render': {'bytes': 100}}}) == []
+    assert nba_bench.compare(now, {'synthetic-15': {'render': {'bytes': 50}}}) == ["synthetic-15/render: rozmiar 50 B -> 100 B"]
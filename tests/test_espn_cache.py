@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+import espn_cache
+
+NOW = datetime(2026, 1, 18, 0, 0, tzinfo=timezone.utc).timestamp()
+
+def event(state, iso_date="2026-01-18T00:30Z"):
+    return {'date': iso_date, 'status': {'type': {'state': state}}}
+
+def payload(*events):
+    return {'events': list(events)}
+
+def test_ttl_live_when_any_game_in_progress():
+    assert espn_cache.ttl_for(payload(event('post'), event('in')), NOW) == espn_cache.TTL_LIVE
+
+def test_ttl_idle_for_finished_or_empty_slate():
+    assert espn_cache.ttl_for(payload(event('post')), NOW) == espn_cache.TTL_IDLE
+    assert espn_cache.ttl_for(payload(), NOW) == espn_cache.TTL_IDLE
+
+def test_ttl_pre_capped_at_earliest_tip_off():
+    slate = payload(event('pre', "2026-01-18T03:00Z"), event('pre', "2026-01-18T00:05Z"), event('post'))
+    assert espn_cache.ttl_for(slate, NOW) == 5 * 60
+
+def test_ttl_pre_far_from_tip_off_stays_idle():
+    assert espn_cache.ttl_for(payload(event('pre', "2026-01-18T03:00Z")), NOW) == espn_cache.TTL_IDLE
+
+def test_ttl_pre_past_tip_off_is_live():
+    # Mecz powinien już trwać, a ESPN wciąż pokazuje 'pre' (opóźniony start) -> odpytujemy często
+    assert espn_cache.ttl_for(payload(event('pre', "2026-01-17T23:50Z")), NOW) == espn_cache.TTL_LIVE
+
+def test_ttl_pre_without_date_stays_idle():
+    assert espn_cache.ttl_for(payload({'status': {'type': {'state': 'pre'}}}), NOW) == espn_cache.TTL_IDLE
+
+class FakeResponse:
+    status_code = 304
+    headers = {}
+
+class FakeSession:
+    def get(self, url, params=None, headers=None, timeout=None):
+        return FakeResponse()
+
+def test_revalidated_entry_gets_fresh_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(espn_cache, "CACHE_DIR", str(tmp_path))
+    tip_off = datetime.fromtimestamp(espn_cache.time.time() + 120, timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+    key = espn_cache.cache_key("http://espn.test/scoreboard")
+    espn_cache.save(key, {"fetched_at": 0, "ttl": espn_cache.TTL_IDLE, "etag": '"v1"',
+                          "last_modified": None, "payload": payload(event('pre', tip_off))})
+    espn_cache.cached_get(FakeSession(), "http://espn.test/scoreboard")
+    assert espn_cache.load(key)["ttl"] <= 120
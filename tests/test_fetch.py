@@ -0,0 +1,92 @@
+import json
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import espn_cache
+import update_nba
+
+def event(event_id, iso_date):
+    return {'id': event_id, 'date': iso_date}
+
+# Scoreboard na dzień (dates=YYYYMMDD); mecz "2" wraca w obu dniach jak przy meczu po północy UTC
+DAYS = {
+    "20260117": {'events': [event("2", "2026-01-18T00:30Z"), event("1", "2026-01-17T20:00Z")]},
+    "20260118": {'events': [event("2", "2026-01-18T00:30Z"), event("3", "2026-01-18T23:00Z")]},
+}
+
+class FakeESPN(BaseHTTPRequestHandler):
+    """Lokalny zamiennik ESPN: payload z DAYS, a najpierw kody błędów z kolejki `failures[dzień]`."""
+
+    def do_GET(self):
+        server = self.server
+        day = parse_qs(urlparse(self.path).query).get('dates', [""])[0]
+        with server.lock:
+            server.requests[day] = server.requests.get(day, 0) + 1
+            queue = server.failures.get(day, [])
+            status = queue.pop(0) if queue else None
+        if status is None and day in DAYS:
+            status, body = 200, json.dumps(DAYS[day]).encode("utf-8")
+        else:
+            status, body = status or 404, b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status in (429, 503):
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def espn(tmp_path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeESPN)
+    server.lock = threading.Lock()
+    server.requests, server.failures = {}, {}
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(update_nba, "ESPN_API", f"http://127.0.0.1:{server.server_port}/scoreboard")
+    monkeypatch.setattr(update_nba, "FETCH_BACKOFF", 0)
+    monkeypatch.setattr(update_nba, "_session", None)
+    monkeypatch.setattr(espn_cache, "CACHE_DIR", str(tmp_path / "espn"))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def test_merge_events_dedupes_and_sorts():
+    events = update_nba.merge_events([DAYS["20260117"], None, DAYS["20260118"]])
+    assert [e['id'] for e in events] == ["1", "2", "3"]
+
+def test_fetch_scoreboards_dedupes_across_days(espn):
+    events = update_nba.fetch_scoreboards(date(2026, 1, 17), date(2026, 1, 18))
+    assert [e['id'] for e in events] == ["1", "2", "3"]
+    assert espn.requests == {"20260117": 1, "20260118": 1}
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_fetch_scoreboards_retries_transient_errors(espn, status):
+    espn.failures["20260117"] = [status, status]
+    events = update_nba.fetch_scoreboards(date(2026, 1, 17), date(2026, 1, 17))
+    assert [e['id'] for e in events] == ["1", "2"]
+    assert espn.requests["20260117"] == 3
+
+def test_fetch_scoreboards_skips_day_after_retries(espn, capsys):
+    espn.failures["20260117"] = [503] * (update_nba.FETCH_RETRIES + 1)
+    events = update_nba.fetch_scoreboards(date(2026, 1, 17), date(2026, 1, 18))
+    assert [e['id'] for e in events] == ["2", "3"]
+    assert espn.requests["20260117"] == update_nba.FETCH_RETRIES + 1
+    assert "1/2 dni" in capsys.readouterr().out
+
+def test_fetch_scoreboards_all_days_failed(espn):
+    for day in DAYS:
+        espn.failures[day] = [500] * (update_nba.FETCH_RETRIES + 1)
+    assert update_nba.fetch_scoreboards(date(2026, 1, 17), date(2026, 1, 18)) is None
+
+def test_fetch_scoreboards_empty_range(espn):
+    assert update_nba.fetch_scoreboards(date(2026, 1, 18), date(2026, 1, 17)) == []
+    assert espn.requests == {}
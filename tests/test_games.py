@@ -0,0 +1,78 @@
+import copy
+
+import pytest
+
+import nba_games
+import update_nba
+
+EVENT = {
+    'id': '401',
+    'date': '2026-01-18T00:30Z',
+    'season': {'year': 2026, 'type': 2},
+    'status': {'period': 3, 'displayClock': '5:00',
+               'type': {'state': 'in', 'detail': 'Q3 5:00', 'shortDetail': 'Q3 5:00'}},
+    'competitions': [{'competitors': [
+        {'homeAway': 'home', 'score': '80',
+         'team': {'abbreviation': 'BOS', 'shortDisplayName': 'Celtics'},
+         'records': [{'type': 'total', 'summary': '10-5'}]},
+        {'homeAway': 'away', 'score': '75',
+         'team': {'abbreviation': 'LAL', 'shortDisplayName': 'Lakers'},
+         'records': [{'type': 'total', 'summary': '8-7'}]},
+    ]}],
+}
+
+def mutated(change):
+    event = copy.deepcopy(EVENT)
+    change(event)
+    return event
+
+def test_parse_event():
+    game, errors = nba_games.parse_event(EVENT)
+    assert errors == []
+    assert (game.day, game.home.abbr, game.home.score, game.away.record) == ('2026-01-17', 'BOS', 80, '8-7')
+    assert game.seconds_left == 5 * 60 + 12 * 60
+
+# Kształty, przy których mecz odpada (brak czegoś niezbędnego)
+@pytest.mark.parametrize("change", [
+    lambda e: e['competitions'][0].update(competitors=None),
+    lambda e: e['competitions'][0]['competitors'].__setitem__(0, "x"),
+    lambda e: e.update(status="x"),
+    lambda e: e['status'].update(type=[]),
+])
+def test_malformed_event_is_dropped(change):
+    game, errors = nba_games.parse_event(mutated(change))
+    assert game is None
+    assert errors
+
+# Kształty, przy których mecz zostaje z wartością domyślną i błędem pola
+@pytest.mark.parametrize("change, field", [
+    (lambda e: e['competitions'][0]['competitors'][0].update(records=["x"]), "home.records[0]"),
+    (lambda e: e['competitions'][0]['competitors'][0].update(records="x"), "home.records"),
+    (lambda e: e['status'].update(displayClock=5), "status.displayClock"),
+    (lambda e: e['competitions'][0]['competitors'][1].update(score="x"), "away.score"),
+])
+def test_malformed_field_falls_back(change, field):
+    game, errors = nba_games.parse_event(mutated(change))
+    assert game is not None
+    assert any(error.startswith(field) for error in errors)
+    game.seconds_left
+
+def test_prepare_games_survives_unexpected_shapes(monkeypatch, tmp_path):
+    monkeypatch.setattr(update_nba.nba_store, "DB_PATH", str(tmp_path / "db.sqlite"))
+    events = [EVENT, "x", mutated(lambda e: e.update(status="x")), {'id': None}]
+    games = update_nba.prepare_games(events)
+    assert [g.id for g in games] == ['401']
+
+def test_prepare_games_counts_parser_crash_as_failed(monkeypatch, tmp_path):
+    monkeypatch.setattr(update_nba.nba_store, "DB_PATH", str(tmp_path / "db.sqlite"))
+    parse = nba_games.parse_event
+
+    def flaky(event):
+        if event.get('id') == 'boom':
+            raise RuntimeError("boom")
+        return parse(event)
+    monkeypatch.setattr(nba_games, "parse_event", flaky)
+    metrics = update_nba.nba_metrics.start_run("test")
+    games = update_nba.prepare_games([{'id': 'boom'}, EVENT])
+    assert [g.id for g in games] == ['401']
+    assert metrics.counters['events_failed'] == 1
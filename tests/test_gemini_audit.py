@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+import gemini_audit
+from gemini_audit import AUDIT_END, AUDIT_START, inject_report
+from nba_render import write_page
+
+PAGE = '<html><body><div class="grid">karty</div><div class="footer">stopka</div></body></html>'
+
+# --- WSTRZYKIWANIE RAPORTU DO index.html ---
+def test_first_run_inserts_above_footer():
+    html = inject_report(PAGE, "raport")
+    assert html.index(AUDIT_START) < html.index('<div class="footer">')
+    assert html.count(AUDIT_START) == html.count(AUDIT_END) == 1
+    assert "karty" in html and "stopka" in html
+
+def test_fallback_before_body_end_without_footer():
+    html = inject_report("<html><body><p>x</p></body></html>", "raport")
+    assert html.endswith(AUDIT_START + "raport" + AUDIT_END + "</body></html>")
+
+def test_repeated_audits_keep_page_size_flat():
+    html = inject_report(PAGE, "raport")
+    size = len(html)
+    for i in range(50):
+        html = inject_report(html, "raport")
+        assert len(html) == size
+    assert html.count(AUDIT_START) == 1
+    html = inject_report(html, "nowy")
+    assert "nowy" in html and "raport" not in html
+
+def test_orphaned_start_marker_keeps_page_content():
+    html = PAGE.replace("karty", "X" + AUDIT_START + "Y")
+    for text in ("pierwszy", "drugi"):
+        html = inject_report(html, text)
+        assert "X" in html and "Y" in html and "stopka" in html
+        assert html.count(AUDIT_START) == html.count(AUDIT_END) == 1
+    assert "drugi" in html and "pierwszy" not in html
+
+# --- BEZPIECZNIK ROZMIARU ---
+@pytest.fixture
+def audit_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(gemini_audit, "AUDIT_CACHE_DIR", str(tmp_path / "gemini"))
+    monkeypatch.setattr(gemini_audit, "_client", gemini_audit.FakeClient())
+    (tmp_path / "propozycje_typow.txt").write_text("Lakers @ Celtics -> Typ: Celtics (63%)", encoding="utf-8")
+    (tmp_path / "index.html").write_text(PAGE, encoding="utf-8")
+    return tmp_path
+
+def test_standalone_audit_refuses_oversized_page(audit_dir, monkeypatch):
+    monkeypatch.setattr(gemini_audit, "MAX_HTML_BYTES", len(PAGE) + 10)
+    gemini_audit._run_audit()
+    assert (audit_dir / "index.html").read_text(encoding="utf-8") == PAGE
+
+def test_standalone_audit_injects_within_limit(audit_dir):
+    gemini_audit._run_audit()
+    assert AUDIT_START in (audit_dir / "index.html").read_text(encoding="utf-8")
+
+def test_write_page_refuses_oversized_page(tmp_path):
+    path = str(tmp_path / "index.html")
+    write_page(path, ["a" * 100], "", max_bytes=1000)
+    page_hash, written = write_page(path, ["b" * 2000], "", previous_hash="old", max_bytes=1000)
+    assert (page_hash, written) == ("old", False)
+    assert open(path).read() == "a" * 100
+    assert not os.path.exists(path + ".tmp")
+
+# --- AUDYT PER MECZ (FakeClient) ---
+PICKS = ["Lakers @ Celtics -> Typ: Celtics (63%)", "Heat @ Knicks -> Typ: Knicks (58%)"]
+
+class FlakyClient(gemini_audit.FakeClient):
+    """FakeClient, który najpierw zwraca zadane błędy API, a potem zwykłą odpowiedź."""
+
+    def __init__(self, failures=(), fail_on=None):
+        super().__init__()
+        self.failures = list(failures)
+        self.fail_on = fail_on
+
+    def generate_content(self, model, contents, config=None):
+        if self.fail_on and self.fail_on in contents:
+            raise gemini_audit.errors.APIError(400, {'error': {'message': 'bad request'}})
+        if self.failures:
+            self.calls += 1
+            raise gemini_audit.errors.APIError(self.failures.pop(0), {'error': {'message': 'retry'}})
+        return super().generate_content(model, contents, config)
+
+@pytest.fixture
+def audit_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(gemini_audit, "AUDIT_CACHE_DIR", str(tmp_path / "gemini"))
+    monkeypatch.setattr(gemini_audit.time, "sleep", lambda seconds: None)
+    return tmp_path
+
+def test_cache_hit_within_ttl(audit_cache):
+    client = gemini_audit.FakeClient()
+    first = gemini_audit.audit_picks(PICKS, "2026-01-18", client=client)
+    second = gemini_audit.audit_picks(PICKS, "2026-01-18", client=client)
+    assert client.calls == len(PICKS)
+    assert first == second
+
+def test_cache_miss_after_ttl(audit_cache):
+    stale = gemini_audit.time.time() - gemini_audit.AUDIT_CACHE_TTL - 1
+    gemini_audit.save_cached_audit(PICKS[0], "2026-01-18", "stary audyt", stale)
+    client = gemini_audit.FakeClient()
+    [(_, text, created)] = gemini_audit.audit_picks(PICKS[:1], "2026-01-18", client=client)
+    assert client.calls == 1
+    assert text != "stary audyt" and created > stale
+
+@pytest.mark.parametrize("code", [429, 503])
+def test_retry_on_retryable_api_error(audit_cache, code):
+    client = FlakyClient(failures=[code, code])
+    [(_, text, _)] = gemini_audit.audit_picks(PICKS[:1], "2026-01-18", client=client)
+    assert text is not None
+    assert client.calls == 3
+
+def test_gives_up_after_retries(audit_cache):
+    client = FlakyClient(failures=[503] * (gemini_audit.AUDIT_RETRIES + 1))
+    [(_, text, _)] = gemini_audit.audit_picks(PICKS[:1], "2026-01-18", client=client)
+    assert text is None
+    assert client.calls == gemini_audit.AUDIT_RETRIES + 1
+
+def test_one_failed_matchup_still_reports_the_others(audit_cache, monkeypatch):
+    monkeypatch.setattr(gemini_audit, "_client", FlakyClient(fail_on="Heat @ Knicks"))
+    block = gemini_audit.build_audit_block(PICKS)
+    assert block.startswith(AUDIT_START) and block.endswith(AUDIT_END)
+    assert "Lakers @ Celtics" in block and "ZATWIERDZONY" in block
+    assert "Heat @ Knicks" in block and "Audyt niedostępny" in block
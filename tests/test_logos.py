@@ -0,0 +1,71 @@
+import os
+import shutil
+
+import pytest
+
+import nba_logos
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "logos")
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+@pytest.fixture
+def logo_dir(tmp_path):
+    path = tmp_path / "logos"
+    shutil.copytree(FIXTURES, path)
+    return path
+
+def test_symbol_markup_prefixes_ids():
+    symbol = nba_logos.symbol_markup("1610612740", fixture("1610612740.svg"))
+    assert symbol.startswith('<symbol id="team-1610612740" viewBox="0 0 150 100">')
+    assert 'id="t1610612740-grad"' in symbol and 'url(#t1610612740-grad)' in symbol
+    assert 'id="t1610612740-ball"' in symbol and 'href="#t1610612740-ball"' in symbol
+    assert 'id="grad"' not in symbol and 'url(#grad)' not in symbol
+    # Prolog XML, komentarze i <title> nie trafiają do sprite'a
+    assert "<?xml" not in symbol and "<!--" not in symbol and "<title>" not in symbol
+
+def test_symbol_markup_viewbox_from_width_height():
+    symbol = nba_logos.symbol_markup("1610612744", fixture("1610612744.svg"))
+    assert symbol.startswith('<symbol id="team-1610612744" viewBox="0 0 120 80">')
+
+def test_symbol_markup_rejects_non_svg():
+    with pytest.raises(ValueError):
+        nba_logos.symbol_markup("x", "<html></html>")
+
+def test_unique_logos_dedupes_aliases():
+    logos = nba_logos.unique_logos()
+    assert len(logos) == 31  # 30 drużyn + logo domyślne
+    assert logos[nba_logos.DEFAULT_KEY] == nba_logos.DEFAULT_LOGO
+    for alias, canonical in [("NO", "NOP"), ("GS", "GSW"), ("WSH", "WAS"), ("UTAH", "UTA"), ("SA", "SAS"), ("NY", "NYK")]:
+        assert nba_logos.logo_key(nba_logos.NBA_LOGOS[alias]) == nba_logos.logo_key(nba_logos.NBA_LOGOS[canonical])
+
+def test_build_sprite_manifest(logo_dir, tmp_path):
+    static = tmp_path / "static"
+    manifest = nba_logos.build_sprite(str(logo_dir), str(static), str(static / "logos.json"))
+    assert manifest["teams"] == {
+        "NOP": "team-1610612740", "NO": "team-1610612740",
+        "GSW": "team-1610612744", "GS": "team-1610612744",
+    }
+    assert manifest["default"] == "team-nba"
+    assert nba_logos.load_manifest(str(static / "logos.json")) == manifest
+    with open(manifest["sprite"], "r", encoding="utf-8") as f:
+        sprite = f.read()
+    assert sprite.count("<symbol ") == 3
+
+def test_build_sprite_name_follows_content_hash(logo_dir, tmp_path):
+    static = tmp_path / "static"
+    first = nba_logos.build_sprite(str(logo_dir), str(static), str(static / "logos.json"))
+    same = nba_logos.build_sprite(str(logo_dir), str(static), str(static / "logos.json"))
+    assert same["sprite"] == first["sprite"]
+
+    (logo_dir / "nba.svg").write_text(fixture("nba.svg").replace("#c8102e", "#17408b"), encoding="utf-8")
+    changed = nba_logos.build_sprite(str(logo_dir), str(static), str(static / "logos.json"))
+    assert changed["sprite"] != first["sprite"]
+    # Stara wersja sprite'a jest usuwana, zostaje tylko aktualna
+    assert sorted(p.name for p in static.glob("logos.*.svg")) == [os.path.basename(changed["sprite"])]
+
+def test_build_sprite_without_logos(tmp_path):
+    static = tmp_path / "static"
+    assert nba_logos.build_sprite(str(tmp_path / "empty"), str(static), str(static / "logos.json")) is None
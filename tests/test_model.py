@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+import nba_model
+from nba_games import Game, TeamSide
+
+def live_game(period, clock):
+    return Game(id='401', date='2026-01-18T00:30Z', day='2026-01-17', season=2026, season_type=2,
+                state='in', detail='', short_detail='', period=period, clock=clock,
+                home=TeamSide('BOS', 'Celtics'), away=TeamSide('LAL', 'Lakers'))
+
+# --- MODEL NA ŻYWO ---
+@pytest.mark.parametrize("pregame", [0.2, 0.5, 0.64, 0.9])
+def test_live_prob_at_tip_off_equals_pregame(pregame):
+    assert nba_model.live_win_prob(0, 48 * 60, pregame) == pytest.approx(pregame)
+
+def test_live_prob_at_final_buzzer_follows_margin():
+    probs = nba_model.live_win_prob([3, -1, 0], [0, 0, 0], [0.1, 0.9, 0.8])
+    assert probs[0] > 0.999 and probs[1] < 0.001
+    assert probs[2] == pytest.approx(0.5)
+
+def test_live_prob_vectorised_and_monotonic_in_margin():
+    probs = nba_model.live_win_prob(np.arange(-10, 11), np.full(21, 600), np.full(21, 0.5))
+    assert probs.shape == (21,)
+    assert np.all(np.diff(probs) > 0)
+    assert probs[10] == pytest.approx(0.5)
+
+@pytest.mark.parametrize("period, clock, expected", [
+    (0, "0:00", 48 * 60),           # przed pierwszym gwizdkiem
+    (1, "12:00", 48 * 60),
+    (2, "0.0", 2 * 12 * 60),        # przerwa (ESPN podaje zegar bez minut)
+    (3, "5:30", 5 * 60 + 30 + 12 * 60),
+    (4, "0:24.5", 24.5),
+    (5, "3:12", 3 * 60 + 12),       # dogrywka: tylko zegar dogrywki
+    (6, "0.0", 0),
+])
+def test_seconds_left(period, clock, expected):
+    assert live_game(period, clock).seconds_left == pytest.approx(expected)
+
+def test_seconds_left_bad_clock():
+    assert live_game(4, "--").seconds_left == 0
+
+# --- ELO ---
+def final(espn_id, season, day, home, away, home_score, away_score):
+    return {'espn_id': espn_id, 'season': season, 'game_date': day, 'home_abbr': home, 'away_abbr': away,
+            'home_score': home_score, 'away_score': away_score}
+
+FINALS = [
+    final('1', 2025, '2025-01-10', 'BOS', 'LAL', 110, 100),
+    final('2', 2025, '2025-01-10', 'MIA', 'NY', 95, 101),
+    final('3', 2025, '2025-01-11', 'LAL', 'MIA', 120, 90),
+]
+
+def test_predict_equal_teams_favours_home():
+    model = nba_model.EloModel()
+    p = model.predict(['BOS'], ['LAL'])[0]
+    assert p > 0.5
+    assert p == pytest.approx(nba_model.win_prob(nba_model.HOME_ADV))
+
+def test_update_is_zero_sum():
+    model = nba_model.EloModel()
+    model.update(['BOS', 'MIA', 'LAL'], ['LAL', 'NY', 'BOS'], [110, 95, 99], [100, 101, 130])
+    assert model.ratings.sum() == pytest.approx(nba_model.ELO_BASE * len(model.teams))
+    assert model.rating('NY') > nba_model.ELO_BASE > model.rating('MIA')
+    assert list(model.played[model.ids(['BOS', 'LAL', 'MIA', 'NY'])]) == [2, 2, 1, 1]
+
+def test_update_uses_team_aliases():
+    model = nba_model.EloModel()
+    model.update(['NYK'], ['GSW'], [100], [90])
+    assert model.rating('NY') > nba_model.ELO_BASE
+    assert set(model.teams) == {'NY', 'GS'}
+
+def test_fit_is_incremental():
+    model = nba_model.EloModel()
+    assert model.fit(FINALS) == 3
+    ratings = model.ratings.copy()
+    assert model.fit(FINALS) == 0
+    np.testing.assert_array_equal(model.ratings, ratings)
+
+    more = FINALS + [final('4', 2025, '2025-01-12', 'NY', 'BOS', 100, 102)]
+    assert model.fit(more) == 1
+    assert model.rating('BOS') > ratings[model.ids(['BOS'])[0]]
+
+def test_fit_in_one_go_equals_day_by_day():
+    whole, daily = nba_model.EloModel(), nba_model.EloModel()
+    whole.fit(FINALS)
+    daily.fit(FINALS[:2])
+    daily.fit(FINALS)
+    np.testing.assert_allclose(whole.ratings, daily.ratings)
+
+def test_new_season_carryover_pulls_towards_base():
+    model = nba_model.EloModel()
+    model.fit(FINALS)
+    before = model.ratings.copy()
+    model.fit([final('10', 2026, '2025-10-22', 'DEN', 'PHX', 100, 99)])
+    carried = nba_model.ELO_BASE + model.carryover * (before - nba_model.ELO_BASE)
+    old = model.ids(['BOS', 'LAL', 'MIA', 'NY'])
+    np.testing.assert_allclose(model.ratings[old], carried[old])
+    assert np.all(np.abs(model.ratings[old] - nba_model.ELO_BASE) < np.abs(before[old] - nba_model.ELO_BASE))
+    assert model.season == 2026 and model.played[old].sum() == 0
+
+def test_seed_from_records_only_for_teams_without_games():
+    model = nba_model.EloModel()
+    model.fit(FINALS)
+    bos = model.rating('BOS')
+    model.seed_from_records(['BOS', 'DEN', 'PHX', 'SAC'], ["0-40", "30-10", "10-30", "0-0"])
+    assert model.rating('BOS') == bos
+    assert model.rating('DEN') > nba_model.ELO_BASE > model.rating('PHX')
+    assert model.rating('SAC') == nba_model.ELO_BASE
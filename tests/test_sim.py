@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+import pytest
+
+import nba_sim
+import nba_store
+import update_nba
+
+def event(event_id, iso_date, state, home, away, home_record, away_record):
+    def competitor(abbr, side, record):
+        return {'homeAway': side, 'score': "0", 'team': {'abbreviation': abbr, 'shortDisplayName': abbr},
+                'records': [{'type': 'total', 'summary': record}]}
+    return {
+        'id': event_id, 'date': iso_date, 'season': {'year': 2026, 'type': 2},
+        'status': {'period': 0, 'displayClock': "0:00",
+                   'type': {'state': state, 'detail': state, 'shortDetail': state}},
+        'competitions': [{'competitors': [competitor(home, 'home', home_record),
+                                          competitor(away, 'away', away_record)]}],
+    }
+
+TODAY = date(2026, 4, 12)
+EVENTS = [
+    # BOS i LAL grały ostatnio dwa dni temu i nie mają już meczu w terminarzu
+    event("1", "2026-04-10T23:30Z", 'post', 'BOS', 'LAL', "60-20", "45-35"),
+    event("2", "2026-04-13T23:30Z", 'pre', 'MIA', 'NY', "40-40", "50-30"),
+]
+
+@pytest.fixture
+def espn(tmp_path, monkeypatch):
+    monkeypatch.setattr(nba_store, "DB_PATH", str(tmp_path / "db.sqlite"))
+    calls = []
+    def fake_fetch(start, end):
+        calls.append((start, end))
+        return EVENTS
+    monkeypatch.setattr(update_nba, "fetch_scoreboards", fake_fetch)
+    return calls
+
+def test_records_of_teams_without_remaining_games(espn):
+    inputs = nba_sim.load_inputs(today=TODAY)
+    assert espn == [(TODAY - timedelta(days=nba_sim.RECORD_LOOKBACK_DAYS), date(2026, 4, 15))]
+    record = {abbr: (int(inputs.base_wins[i]), int(inputs.base_losses[i])) for i, abbr in enumerate(nba_sim.TEAMS)}
+    assert record['BOS'] == (60, 20) and record['LAL'] == (45, 35)
+    assert record['MIA'] == (40, 40) and record['NY'] == (50, 30)
+    assert inputs.game_ids == ["2"]
+
+def test_lookback_after_season_end(espn):
+    nba_sim.load_inputs(today=date(2026, 5, 1))
+    end = date(2026, 4, 15)
+    assert espn == [(end - timedelta(days=nba_sim.RECORD_LOOKBACK_DAYS), end)]
+
+def test_espn_failure_stops_simulation(tmp_path, monkeypatch):
+    monkeypatch.setattr(nba_store, "DB_PATH", str(tmp_path / "db.sqlite"))
+    monkeypatch.setattr(update_nba, "fetch_scoreboards", lambda start, end: None)
+    assert nba_sim.load_inputs(today=TODAY) is None
@@ -0,0 +1,33 @@
+import hashlib
+import time
+from contextlib import closing
+
+import nba_store
+from nba_games import Game, TeamSide
+
+def game(state='pre', home_score=0, away_score=0, home_prob=0.6):
+    return Game(id='401', date='2026-01-18T00:30Z', day='2026-01-17', season=2026, season_type=2,
+                state=state, detail=state, short_detail=state, period=0, clock='0:00',
+                home=TeamSide('BOS', 'Celtics', home_score, '10-5'),
+                away=TeamSide('LAL', 'Lakers', away_score, '8-7'), home_prob=home_prob)
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def test_unchanged_upsert_leaves_db_file_untouched(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    nba_store.record_games([nba_store.game_row(game())], path)
+    before = file_hash(path)
+    time.sleep(1.1)  # inny updated_at (rozdzielczość: sekundy)
+    nba_store.record_games([nba_store.game_row(game())], path)
+    assert file_hash(path) == before
+
+def test_changed_score_updates_row_and_freezes_prediction(tmp_path):
+    path = str(tmp_path / "db.sqlite")
+    nba_store.record_games([nba_store.game_row(game())], path)
+    nba_store.record_games([nba_store.game_row(game('post', 90, 100, home_prob=0.2))], path)
+    with closing(nba_store.connect(path)) as conn:
+        row = conn.execute("SELECT * FROM games").fetchone()
+    assert (row['state'], row['home_score'], row['away_score']) == ('post', 90, 100)
+    assert (row['predicted_winner'], row['home_win_prob'], row['actual_winner']) == ('Celtics', 0.6, 'Lakers')
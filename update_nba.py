@@ -1,367 +1,422 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import argparse
+import asyncio
+import hashlib
 import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import astuple, dataclass
+from datetime import datetime, date, timedelta, timezone
 import os
 
+import espn_cache
+import nba_feed
+import nba_games
+import nba_logos
+import nba_metrics
+import nba_model
+import nba_store
+from nba_logos import DEFAULT_LOGO, NBA_LOGOS
+from nba_render import (
+    MAX_HTML_BYTES, VS_HTML, iter_page_body, render_card_html, render_footer, render_logo_img, render_logo_use,
+    render_score_html, write_page,
+)
+
 # ==========================================
 # ⚙️ KONFIGURACJA
 # ==========================================
-ESPN_API = "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
-
-# Rozszerzony słownik logo
-NBA_LOGOS = {
-    'ATL': 'https://cdn.nba.com/logos/nba/1610612737/global/L/logo.svg',
-    'BOS': 'https://cdn.nba.com/logos/nba/1610612738/global/L/logo.svg',
-    'CLE': 'https://cdn.nba.com/logos/nba/1610612739/global/L/logo.svg',
-    'NOP': 'https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg',
-    'NO':  'https://cdn.nba.com/logos/nba/1610612740/global/L/logo.svg',
-    'CHI': 'https://cdn.nba.com/logos/nba/1610612741/global/L/logo.svg',
-    'DAL': 'https://cdn.nba.com/logos/nba/1610612742/global/L/logo.svg',
-    'DEN': 'https://cdn.nba.com/logos/nba/1610612743/global/L/logo.svg',
-    'GSW': 'https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg',
-    'GS':  'https://cdn.nba.com/logos/nba/1610612744/global/L/logo.svg',
-    'HOU': 'https://cdn.nba.com/logos/nba/1610612745/global/L/logo.svg',
-    'LAC': 'https://cdn.nba.com/logos/nba/1610612746/global/L/logo.svg',
-    'LAL': 'https://cdn.nba.com/logos/nba/1610612747/global/L/logo.svg',
-    'MIA': 'https://cdn.nba.com/logos/nba/1610612748/global/L/logo.svg',
-    'MIL': 'https://cdn.nba.com/logos/nba/1610612749/global/L/logo.svg',
-    'MIN': 'https://cdn.nba.com/logos/nba/1610612750/global/L/logo.svg',
-    'BKN': 'https://cdn.nba.com/logos/nba/1610612751/global/L/logo.svg',
-    'NYK': 'https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg',
-    'NY':  'https://cdn.nba.com/logos/nba/1610612752/global/L/logo.svg',
-    'ORL': 'https://cdn.nba.com/logos/nba/1610612753/global/L/logo.svg',
-    'IND': 'https://cdn.nba.com/logos/nba/1610612754/global/L/logo.svg',
-    'PHI': 'https://cdn.nba.com/logos/nba/1610612755/global/L/logo.svg',
-    'PHX': 'https://cdn.nba.com/logos/nba/1610612756/global/L/logo.svg',
-    'POR': 'https://cdn.nba.com/logos/nba/1610612757/global/L/logo.svg',
-    'SAC': 'https://cdn.nba.com/logos/nba/1610612758/global/L/logo.svg',
-    'SAS': 'https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg',
-    'SA':  'https://cdn.nba.com/logos/nba/1610612759/global/L/logo.svg',
-    'OKC': 'https://cdn.nba.com/logos/nba/1610612760/global/L/logo.svg',
-    'TOR': 'https://cdn.nba.com/logos/nba/1610612761/global/L/logo.svg',
-    'UTA': 'https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg',
-    'MEM': 'https://cdn.nba.com/logos/nba/1610612763/global/L/logo.svg',
-    'WAS': 'https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg',
-    'DET': 'https://cdn.nba.com/logos/nba/1610612765/global/L/logo.svg',
-    'CHA': 'https://cdn.nba.com/logos/nba/1610612766/global/L/logo.svg',
-    'WSH': 'https://cdn.nba.com/logos/nba/1610612764/global/L/logo.svg',
-    'UTAH': 'https://cdn.nba.com/logos/nba/1610612762/global/L/logo.svg',
-}
-DEFAULT_LOGO = 'https://cdn.nba.com/logos/nba/nba-logoman-70x70.svg'
-
-def get_espn_data():
+ESPN_API = os.environ.get("ESPN_API", "http://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard")
+
+# Pobieranie wielu dni naraz: pula wątków + wspólna sesja keep-alive
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+
+# Cache wyrenderowanych kart (fingerprint -> fragment HTML) i hash ostatniej strony
+CACHE_DIR = os.environ.get("NBA_CACHE_DIR", ".cache")
+CARD_CACHE_FILE = os.path.join(CACHE_DIR, "cards.json")
+
+# Tryb daemona: częste odpytywanie gdy trwa mecz, rzadkie gdy nic się nie dzieje
+POLL_LIVE = espn_cache.TTL_LIVE
+POLL_IDLE = 3600
+POLL_RETRY = 120
+
+_session = None
+
+def get_session():
+    # Jedna sesja na proces: pula połączeń keep-alive + ponawianie z backoffem (429/5xx, zerwane połączenia)
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=FETCH_RETRIES,
+            backoff_factor=FETCH_BACKOFF,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=FETCH_WORKERS, pool_maxsize=FETCH_WORKERS, max_retries=retry)
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+def fetch_scoreboard(day=None):
+    # day=None -> domyślny (dzisiejszy) scoreboard ESPN, inaczej parametr dates=YYYYMMDD
+    params = {"dates": day.strftime("%Y%m%d")} if day else None
     try:
-        response = requests.get(ESPN_API, timeout=10)
-        if response.status_code == 200:
-            return response.json()
+        return espn_cache.cached_get(get_session(), ESPN_API, params=params, timeout=FETCH_TIMEOUT)
     except Exception as e:
-        print(f"Błąd połączenia z ESPN: {e}")
+        print(f"Błąd połączenia z ESPN ({day or 'dzisiaj'}): {e}")
     return None
 
-def parse_record(record_str):
-    try:
-        w, l = map(int, record_str.split('-'))
-        total = w + l
-        if total == 0: return 0.0
-        return w / total
-    except:
-        return 0.0
+def date_range(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+def merge_events(payloads):
+    # Scalanie wielu scoreboardów w jedną listę bez duplikatów (klucz: ESPN event id), posortowaną po dacie meczu
+    merged = {}
+    for payload in payloads:
+        if not payload:
+            continue
+        for event in payload.get('events', []):
+            merged.setdefault(event.get('id'), event)
+    return sorted(merged.values(), key=lambda e: e.get('date', ''))
+
+def fetch_scoreboards(start, end, workers=FETCH_WORKERS):
+    days = list(date_range(start, end))
+    if not days:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(days))) as pool:
+        payloads = list(pool.map(fetch_scoreboard, days))
+    failed = sum(1 for p in payloads if p is None)
+    if failed:
+        print(f"⚠️ Nie udało się pobrać {failed}/{len(days)} dni z ESPN.")
+    if failed == len(days):
+        return None
+    return merge_events(payloads)
+
+def get_espn_data(days_back=0, days_ahead=0):
+    if not days_back and not days_ahead:
+        return fetch_scoreboard()
+    today = date.today()
+    events = fetch_scoreboards(today - timedelta(days=days_back), today + timedelta(days=days_ahead))
+    if events is None:
+        return None
+    return {'events': events}
 
 def get_team_logo(abbr):
     if abbr in NBA_LOGOS:
         return NBA_LOGOS[abbr]
     return DEFAULT_LOGO
 
+# Sprite z lokalnymi logami (python nba_logos.py); bez niego karty linkują CDN jak dawniej
+LOGO_MANIFEST = nba_logos.load_manifest()
+
+def team_logo_html(abbr, name, asset_prefix=""):
+    # asset_prefix: ścieżka do katalogu głównego strony dla stron w podkatalogach (archiwum: "../")
+    if LOGO_MANIFEST:
+        symbol = LOGO_MANIFEST['teams'].get(abbr) or LOGO_MANIFEST.get('default')
+        if symbol:
+            return render_logo_use(sprite=asset_prefix + LOGO_MANIFEST['sprite'], symbol=symbol, name=name)
+    return render_logo_img(url=get_team_logo(abbr), name=name)
+
+@dataclass(frozen=True)
+class Pick:
+    # Typ na nadchodzący mecz - przekazywany do audytu w pamięci, tekst tylko przy eksporcie
+    away: str
+    home: str
+    winner: str
+    prob: float
+
+    def __str__(self):
+        return f"{self.away} @ {self.home} -> Typ: {self.winner} ({self.prob:.0%})"
+
 # --- NOWA FUNKCJA DLA GEMINI ---
 def save_picks_for_gemini(picks):
     with open("propozycje_typow.txt", "w", encoding="utf-8") as f:
-        f.write("\n".join(picks))
+        f.write("\n".join(str(p) for p in picks))
     print(f"✅ Zapisano {len(picks)} typów do pliku propozycje_typow.txt dla audytu Gemini.")
 
-def generate_html():
+def card_fingerprint(game):
+    # Wszystko, od czego zależy wygląd karty; nowy sprite (inny hash w nazwie pliku) też unieważnia zapisane karty
+    sprite = LOGO_MANIFEST['sprite'] if LOGO_MANIFEST else None
+    return hashlib.sha1(json.dumps([astuple(game), sprite]).encode("utf-8")).hexdigest()
+
+def render_card(game, asset_prefix=""):
+    state = game.state
+    h_name, a_name = game.home.name, game.away.name
+    h_score, a_score = game.home.score, game.away.score
+    predicted_winner = game.winner
+
+    # LOGO
+    h_logo_html = team_logo_html(game.home.abbr, h_name, asset_prefix)
+    a_logo_html = team_logo_html(game.away.abbr, a_name, asset_prefix)
+
+    # === LOGIKA WYNIKÓW HTML ===
+    is_final = (state == 'post')
+    actual_winner = ""
+    h_score_class = "score"
+    a_score_class = "score"
+    
+    if state == 'pre':
+         score_display_html = VS_HTML
+    else:
+        if is_final:
+            if h_score > a_score:
+                actual_winner = h_name
+                h_score_class += " winner"; a_score_class += " loser"
+            else:
+                actual_winner = a_name
+                a_score_class += " winner"; h_score_class += " loser"
+        
+        score_display_html = render_score_html(
+            a_score_class=a_score_class, a_score=a_score,
+            h_score_class=h_score_class, h_score=h_score,
+        )
+
+    # Status
+    status_text = game.detail
+    status_class = "status"
+    if state == 'in': 
+        status_class += " live"
+        status_text = "🔴 " + game.short_detail
+
+    # Ikona wyniku
+    outcome_icon = ""
+    if is_final:
+        outcome_icon = ' <span style="color: #10b981;">✅</span>' if predicted_winner == actual_winner else ' <span style="color: #ef4444;">❌</span>'
+    
+    if game.home_prob is None:
+        # Stare wpisy bazy (archiwum) sprzed zapisywania prawdopodobieństwa
+        prediction_content = "—"
+    else:
+        prediction_content = f'{predicted_winner} <span class="pred-prob">{game.winner_prob:.0%}</span>{outcome_icon}'
+    if state == 'in' and game.live_prob is not None:
+        live_leader = h_name if game.live_prob >= 0.5 else a_name
+        live_prob = max(game.live_prob, 1 - game.live_prob)
+        prediction_content += f' <span class="live-prob">LIVE: {live_leader} {live_prob:.0%}</span>'
+
+    # Budowanie karty HTML
+    card_html = render_card_html(
+        status_class=status_class, status_text=status_text,
+        a_logo_html=a_logo_html, a_name=a_name,
+        h_logo_html=h_logo_html, h_name=h_name,
+        score_display_html=score_display_html,
+        prediction_content=prediction_content,
+    )
+    return card_html
+
+def load_card_cache():
+    try:
+        with open(CARD_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"page_hash": None, "cards": {}}
+
+def save_card_cache(cache):
+    os.makedirs(os.path.dirname(CARD_CACHE_FILE), exist_ok=True)
+    tmp = CARD_CACHE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, CARD_CACHE_FILE)
+
+def prepare_games(events):
+    # Etap "parse": jeden przebieg po eventach -> Game; etap "predict": model Elo dla całego zestawu naraz
+    games = []
+    with nba_metrics.stage("parse"):
+        for event in events:
+            event_id = event.get('id') if isinstance(event, dict) else None
+            try:
+                game, errors = nba_games.parse_event(event)
+            except Exception as e:
+                # Kształt, którego parser nie przewidział - odpada tylko ten mecz, nie cały przebieg
+                nba_metrics.count("events_failed")
+                print(f"Błąd przy przetwarzaniu meczu {event_id}: {e}")
+                continue
+            if errors:
+                nba_metrics.count("field_errors", len(errors))
+                print(f"⚠️ Mecz {event_id}: {'; '.join(errors)}")
+            if game is None:
+                nba_metrics.count("events_failed")
+                continue
+            games.append(game)
+    nba_metrics.count("events_processed", len(games))
+    if not games:
+        return []
+
+    with nba_metrics.stage("predict"):
+        # Ratingi tylko z wyników sprzed pierwszego dnia na liście; drużyny bez historii startują z bilansu
+        model = nba_model.load_model(before=min(game.day for game in games))
+        model.seed_from_records(
+            [game.home.abbr for game in games] + [game.away.abbr for game in games],
+            [game.home.record for game in games] + [game.away.record for game in games],
+        )
+        probs = model.predict([game.home.abbr for game in games], [game.away.abbr for game in games])
+        for game, p in zip(games, probs):
+            game.home_prob = round(float(p), 3)
+
+        # Mecze w trakcie: szansa na żywo z przewagi, czasu do końca i prognozy sprzed meczu - wszystkie naraz
+        live = [game for game in games if game.state == 'in']
+        if live:
+            live_probs = nba_model.live_win_prob(
+                [game.home.score - game.away.score for game in live],
+                [game.seconds_left for game in live],
+                [game.home_prob for game in live],
+            )
+            for game, p in zip(live, live_probs):
+                game.live_prob = round(float(p), 3)
+    nba_metrics.count("live_games", len(live))
+    return games
+
+def record_history(games):
+    # Upsert wszystkich widzianych meczów do bazy historycznej (typ + późniejszy wynik)
+    try:
+        rows = [nba_store.game_row(game) for game in games]
+        nba_store.record_games(rows)
+        print(f"🗄️ Baza historyczna: zapisano {len(rows)} meczów ({nba_store.DB_PATH}).")
+    except Exception as e:
+        print(f"Błąd zapisu bazy historycznej: {e}")
+
+def generate_html(days_back=0, days_ahead=0, auditor=None, export_picks=True, profile=None, run_name="update_nba"):
+    """fetch -> predict -> render (+ opcjonalny audyt) -> jeden zapis index.html.
+    auditor(picks) zwraca gotowy blok HTML raportu; działa w tle równolegle z renderowaniem kart.
+    Metryki przebiegu trafiają do metrics.json, a z profile=PLIK także profil cProfile."""
+    metrics = nba_metrics.start_run(run_name)
+    try:
+        with nba_metrics.profiled(profile):
+            return _generate_html(days_back, days_ahead, auditor, export_picks)
+    finally:
+        metrics.write()
+
+def _generate_html(days_back, days_ahead, auditor, export_picks):
     print("🚀 URUCHAMIAM NBA UPDATE BOT...")
     
-    data = get_espn_data()
+    with nba_metrics.stage("fetch"):
+        data = get_espn_data(days_back, days_ahead)
     if not data or 'events' not in data:
+        nba_metrics.count("fetch_failed")
         print("❌ Brak danych z ESPN.")
         return
 
-    events = data['events']
-    
-    # Lista do zbierania typów dla Gemini
-    picks_for_gemini = []
-
-    # --- NAGŁÓWEK I STYLE HTML ---
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="pl">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>NBA PUBLIC SCOREBOARD</title>
-        <link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>🏀</text></svg>">
-        <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;800;900&display=swap" rel="stylesheet">
-        <style>
-            :root {{ 
-                --bg: #0f172a; 
-                --card-bg: #1e293b; 
-                --accent: #3b82f6; 
-                --text: #f8fafc; 
-                --subtext: #94a3b8;
-                --win: #10b981; 
-                --loss: #ef4444; 
-                --border: #334155; 
-            }}
-            
-            body {{ background-color: var(--bg); color: var(--text); font-family: 'Montserrat', sans-serif; margin: 0; padding: 20px; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            
-            header {{ text-align: center; margin-bottom: 40px; padding-bottom: 20px; border-bottom: 1px solid var(--border); }}
-            h1 {{ font-weight: 900; letter-spacing: -1px; margin: 0; color: var(--accent); font-size: 2.5rem; }}
-            .subtitle {{ color: var(--subtext); font-size: 0.9rem; text-transform: uppercase; letter-spacing: 1px; margin-top: 10px; }}
-            
-            .grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(450px, 1fr));
-                gap: 25px;
-            }}
-            
-            .card {{ 
-                background: var(--card-bg); 
-                border: 1px solid var(--border); 
-                border-radius: 20px;
-                overflow: hidden; 
-                display: flex; 
-                flex-direction: column;
-                transition: transform 0.2s, box-shadow 0.2s;
-                box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.2);
-            }}
-            
-            .card:hover {{ transform: translateY(-5px); box-shadow: 0 20px 25px -5px rgba(0, 0, 0, 0.3); border-color: var(--accent); }}
-            
-            .card-header {{ 
-                background: rgba(0,0,0,0.3); 
-                padding: 12px 25px; 
-                display: flex; 
-                justify-content: center; 
-                align-items: center; 
-                border-bottom: 1px solid var(--border);
-                position: relative; z-index: 2;
-            }}
-            
-            .status {{ font-size: 0.75rem; font-weight: 900; color: var(--subtext); text-transform: uppercase; letter-spacing: 1px; }}
-            .live {{ color: #ef4444; animation: pulse 1.5s infinite; }}
-            
-            .matchup {{ 
-                display: flex; 
-                justify-content: space-between; 
-                align-items: center; 
-                padding: 30px 20px; 
-                position: relative;
-                flex-grow: 1;
-            }}
-            
-            .team {{ 
-                text-align: center; 
-                width: 30%; 
-                height: 140px; 
-                position: relative; 
-                display: flex;
-                justify-content: center;
-                align-items: center;
-            }}
-            
-            .team-name {{ 
-                font-weight: 900; 
-                font-size: 0.85rem; 
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-                position: absolute; 
-                bottom: 0;
-                left: 50%;
-                transform: translateX(-50%);
-                width: 100%;
-                z-index: 3; 
-                text-shadow: 0 2px 4px rgba(0,0,0,1); 
-                padding-bottom: 5px;
-            }}
-            
-            .team-logo {{
-                width: 120px;
-                height: 120px;
-                object-fit: contain;
-                z-index: 1;
-                opacity: 0.9; 
-                margin-bottom: 15px; 
-            }}
-            
-            .score-container {{
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                gap: 15px;
-                position: relative; z-index: 2;
-            }}
-            
-            .score {{ font-size: 2.8rem; font-weight: 900; line-height: 1; text-shadow: 0 2px 5px rgba(0,0,0,0.8); }}
-            .score.winner {{ color: var(--win); }}
-            .score.loser {{ color: var(--subtext); opacity: 0.8; }}
-            
-            .vs-sep {{ color: var(--border); font-style: italic; font-weight: 900; font-size: 1.5rem; }}
-            
-            .prediction-box {{ 
-                background: rgba(15, 23, 42, 0.6);
-                padding: 20px; 
-                text-align: center; 
-                border-top: 1px solid var(--border); 
-                margin-top: auto;
-                position: relative; z-index: 2;
-            }}
-            
-            .pred-label {{ font-size: 0.7rem; color: var(--subtext); text-transform: uppercase; font-weight: 700; letter-spacing: 1px; margin-bottom: 8px; }}
-            .pred-val {{ font-size: 1.2rem; font-weight: 900; color: var(--text); display: flex; align-items: center; justify-content: center; gap: 8px; }}
-            
-            .footer {{ text-align: center; color: var(--subtext); font-size: 0.75rem; margin-top: 50px; padding-bottom: 20px; }}
-            @keyframes pulse {{ 0% {{ opacity: 1; }} 50% {{ opacity: 0.5; }} 100% {{ opacity: 1; }} }}
-            @media (max-width: 768px) {{ .grid {{ grid-template-columns: 1fr; }} .matchup {{ padding: 25px 15px; }} .score {{ font-size: 2.2rem; }} }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <h1>NBA PUBLIC HUB</h1>
-                <div class="subtitle">Live Scores & Automated Models</div>
-            </header>
-            <div class="grid">
-    """
-
-    count = 0
-    for event in events:
-        try:
-            competition = event['competitions'][0]
-            competitors = competition['competitors']
-            status = event['status']['type']
-            state = status['state'] # 'pre', 'in', 'post'
-            
-            # Pobieranie drużyn
-            home_team = next(t for t in competitors if t['homeAway'] == 'home')
-            away_team = next(t for t in competitors if t['homeAway'] == 'away')
-            
-            h_name = home_team['team']['shortDisplayName']
-            a_name = away_team['team']['shortDisplayName']
-            h_abbr = home_team['team']['abbreviation']
-            a_abbr = away_team['team']['abbreviation']
-
-            # LOGO
-            h_logo_url = get_team_logo(h_abbr)
-            a_logo_url = get_team_logo(a_abbr)
-            
-            # Wyniki i Rekordy
-            h_score = int(home_team.get('score', 0))
-            a_score = int(away_team.get('score', 0))
-            h_record_str = next((s['summary'] for s in home_team.get('records', []) if s['type'] == 'total'), "0-0")
-            a_record_str = next((s['summary'] for s in away_team.get('records', []) if s['type'] == 'total'), "0-0")
-
-            # === LOGIKA PROGNOZY ===
-            h_pct = parse_record(h_record_str)
-            a_pct = parse_record(a_record_str)
-            
-            if (h_pct + 0.05) > a_pct:
-                predicted_winner = h_name
-            else:
-                predicted_winner = a_name
-            
-            # DODAJEMY DO LISTY DLA GEMINI (tylko nadchodzące mecze)
-            if state == 'pre':
-                picks_for_gemini.append(f"{a_name} @ {h_name} -> Typ: {predicted_winner}")
-
-            # === LOGIKA WYNIKÓW HTML ===
-            is_final = (state == 'post')
-            actual_winner = ""
-            h_score_class = "score"
-            a_score_class = "score"
-            
-            if state == 'pre':
-                 score_display_html = f'<span class="vs-sep" style="font-size: 2rem;">VS</span>'
+    games = prepare_games(data['events'])
+    with nba_metrics.stage("store"):
+        record_history(games)
+
+    # Typy dla Gemini (tylko nadchodzące mecze) - obiekty w pamięci, nie linie tekstu
+    picks_for_gemini = [
+        Pick(game.away.name, game.home.name, game.winner, game.winner_prob)
+        for game in games if game.state == 'pre'
+    ]
+
+    # Karty renderowane tylko gdy zmienił się ich fingerprint (cache fragmentów po ESPN event id)
+    card_cache = load_card_cache()
+    cached_cards = card_cache.get("cards", {})
+    fresh_cards = {}
+    reused = 0
+
+    def iter_cards():
+        # Generator kart - fragmenty idą prosto do pliku, nic nie jest sklejane w pamięci
+        nonlocal reused
+        for game in games:
+            fp = card_fingerprint(game)
+            cached = cached_cards.get(game.id)
+            if cached and cached['fp'] == fp:
+                card_html = cached['html']
+                reused += 1
             else:
-                if is_final:
-                    if h_score > a_score:
-                        actual_winner = h_name
-                        h_score_class += " winner"; a_score_class += " loser"
-                    else:
-                        actual_winner = a_name
-                        a_score_class += " winner"; h_score_class += " loser"
-                
-                score_display_html = f"""
-                    <span class="{a_score_class}">{a_score}</span>
-                    <span class="vs-sep">:</span>
-                    <span class="{h_score_class}">{h_score}</span>
-                """
-
-            # Status
-            status_text = status['detail']
-            status_class = "status"
-            if state == 'in': 
-                status_class += " live"
-                status_text = "🔴 " + status['shortDetail']
-
-            # Ikona wyniku
-            outcome_icon = ""
-            if is_final:
-                outcome_icon = ' <span style="color: #10b981;">✅</span>' if predicted_winner == actual_winner else ' <span style="color: #ef4444;">❌</span>'
-            
-            prediction_content = f'{predicted_winner}{outcome_icon}'
-
-            # Budowanie karty HTML
-            html += f"""
-            <div class="card">
-                <div class="card-header">
-                    <span class="{status_class}">{status_text}</span>
-                </div>
-                <div class="matchup">
-                    <div class="team">
-                        <img src="{a_logo_url}" class="team-logo" alt="{a_name}">
-                        <span class="team-name">{a_name}</span>
-                    </div>
-                    <div class="score-container">
-                        {score_display_html}
-                    </div>
-                    <div class="team">
-                        <img src="{h_logo_url}" class="team-logo" alt="{h_name}">
-                        <span class="team-name">{h_name}</span>
-                    </div>
-                </div>
-                <div class="prediction-box">
-                    <div class="pred-label">Prognoza Modelu Publicznego</div>
-                    <div class="pred-val">{prediction_content}</div>
-                </div>
-            </div>
-            """
-            count += 1
-        except Exception as e:
-            print(f"Błąd przy przetwarzaniu meczu: {e}")
-            continue
+                card_html = render_card(game)
+            fresh_cards[game.id] = {'fp': fp, 'html': card_html}
+            yield card_html
 
-    if count == 0:
-        html += "<p style='text-align:center; color:#888;'>Brak meczów w harmonogramie ESPN.</p>"
-
-    # Zamknięcie HTML
-    html += f"""
-            </div>
-            <div class="footer">
-                Automatyczna aktualizacja: {datetime.now().strftime("%Y-%m-%d %H:%M")} | Data Source: ESPN
-            </div>
-        </div>
-    </body>
-    </html>
-    """
-    
-    # ZAPIS PLIKÓW
-    with open("index.html", "w", encoding="utf-8") as f:
-        f.write(html)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        audit_future = pool.submit(auditor, picks_for_gemini) if auditor and picks_for_gemini else None
+
+        def iter_body():
+            yield from iter_page_body(iter_cards())
+            # Blok audytu trafia przed stopkę dopiero gdy karty są już zapisane
+            if audit_future:
+                try:
+                    with nba_metrics.stage("audit_wait"):
+                        fragment = audit_future.result()
+                except Exception as e:
+                    print(f"Błąd audytu Gemini: {e}")
+                    fragment = None
+                if fragment:
+                    yield fragment
+
+        # ZAPIS PLIKÓW (tylko gdy treść strony faktycznie się zmieniła - hash bez stopki z czasem)
+        footer = render_footer(updated=datetime.now().strftime("%Y-%m-%d %H:%M"))
+        with nba_metrics.stage("render_write"):
+            page_hash, written = write_page("index.html", iter_body(), footer, card_cache.get("page_hash"),
+                                             max_bytes=MAX_HTML_BYTES)
+            save_card_cache({"page_hash": page_hash, "cards": fresh_cards})
+
+    nba_metrics.count("cards_reused", reused)
+    nba_metrics.count("cards_rendered", len(games) - reused)
+    print(f"♻️ Karty: {reused} z cache, {len(games) - reused} przerenderowanych.")
+    if written:
+        nba_metrics.count("bytes_written", os.path.getsize("index.html"))
+    else:
+        print("⏭️ index.html bez zmian - pomijam zapis.")
+
+    try:
+        with nba_metrics.stage("feed"):
+            nba_feed.publish(games, index_written=written)
+    except Exception as e:
+        print(f"Błąd zapisu feedu games.json: {e}")
     
-    save_picks_for_gemini(picks_for_gemini)
+    if export_picks:
+        save_picks_for_gemini(picks_for_gemini)
+    print(f"📦 Cache ESPN: {espn_cache.summary()}")
     print("✅ Wszystkie zadania zakończone sukcesem.")
+    return games
+
+def next_poll_interval(games, now=None):
+    """Ile sekund czekać do następnego odpytania ESPN.
+    Trwa mecz -> POLL_LIVE; najbliższy mecz niedługo -> do jego startu; nic w planie -> POLL_IDLE."""
+    if games is None:
+        return POLL_RETRY
+    if any(game.state == 'in' for game in games):
+        return POLL_LIVE
+    now = now or datetime.now(timezone.utc)
+    upcoming = []
+    for game in games:
+        if game.state == 'pre':
+            tip_off = datetime.fromisoformat(game.date.replace("Z", "+00:00"))
+            upcoming.append((tip_off - now).total_seconds())
+    if not upcoming:
+        return POLL_IDLE
+    return int(min(max(min(upcoming), POLL_LIVE), POLL_IDLE))
+
+async def run_daemon(days_back=0, days_ahead=0, auditor=None, export_picks=True):
+    # Jeden długo żyjący proces: bez zimnego startu, sesja keep-alive i cache kart zostają między cyklami
+    print(f"🔁 Tryb daemona (live: co {POLL_LIVE} s, bez meczów: co {POLL_IDLE} s). Ctrl+C kończy.")
+    while True:
+        try:
+            games = await asyncio.to_thread(generate_html, days_back, days_ahead, auditor, export_picks)
+        except Exception as e:
+            print(f"Błąd cyklu daemona: {e}")
+            games = None
+        interval = next_poll_interval(games)
+        print(f"💤 Następne odświeżenie za {interval} s.")
+        await asyncio.sleep(interval)
 
 if __name__ == "__main__":
-    generate_html()
+    parser = argparse.ArgumentParser(description="NBA Update Bot (ESPN scoreboard -> index.html)")
+    parser.add_argument("--days-back", type=int, default=0, help="ile dni wstecz pobrać (np. wczorajsze wyniki)")
+    parser.add_argument("--days-ahead", type=int, default=0, help="ile dni do przodu pobrać (harmonogram)")
+    parser.add_argument("--daemon", action="store_true", help="działaj w pętli, odświeżając częściej w trakcie meczów")
+    parser.add_argument("--profile", metavar="PLIK", help="zapisz profil cProfile przebiegu (np. run.pstats)")
+    args = parser.parse_args()
+    if args.daemon:
+        try:
+            asyncio.run(run_daemon(args.days_back, args.days_ahead))
+        except KeyboardInterrupt:
+            print("👋 Daemon zatrzymany.")
+    else:
+        generate_html(args.days_back, args.days_ahead, profile=args.profile)